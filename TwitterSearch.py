@@ -1,5 +1,4 @@
 import re
-import time
 from typing import Union
 from collections import defaultdict
 from selenium import webdriver
@@ -10,6 +9,8 @@ from ScholarSearch import ScholarSearch
 from ScholarGsSearch import GoogleSearch
 from bs4 import BeautifulSoup
 from utils import get_str_similarity
+from ai_scholar_toolbox import gs_parser
+from ai_scholar_toolbox.RateLimiter import default_rate_limiter
 
 url_search_dict = {
     'google': 'https://www.google.com/search?q={0}'
@@ -27,6 +28,7 @@ class TwitterSearch(GoogleSearch):
         super().__init__(driver_path)
         self._urlsearch = url_search_dict['google']
         self.print_true = True #NOTE: should be set by users
+        self.rate_limiter = default_rate_limiter
         # initialize scholar_search object
         self.scholar_search = ScholarSearch()
         self.scholar_search.setup()
@@ -145,12 +147,12 @@ class TwitterSearch(GoogleSearch):
     def _search_twitter_from_homepage(self, homepage_url: str, name: str=None, name_from_gs: str=None):
         # get content of scholar homepage using chromedriver
         try:
+            self.rate_limiter.wait(homepage_url)
             self.driver.get(homepage_url)
         except WebDriverException as e:
             if self.print_true:
                 print('[DEBUG] WebDriverException while getting homepage: %s' % homepage_url)
                 print(e)
-        time.sleep(3)
 
         page = self.driver.page_source
         soup = BeautifulSoup(page, "html.parser")
@@ -173,10 +175,15 @@ class TwitterSearch(GoogleSearch):
         return twitter_url_origin_list
 
     def _search_google_helper(self, google_url: str):
-        self.driver.get(google_url)
-        time.sleep(3)
-
-        page = self.driver.page_source
+        for _ in range(3):
+            self.rate_limiter.wait(google_url)
+            self.driver.get(google_url)
+            page = self.driver.page_source
+            # CAPTCHA / unusual traffic page: back off and retry
+            if not gs_parser.is_blocked(page):
+                self.rate_limiter.success(google_url)
+                break
+            self.rate_limiter.backoff(google_url)
         soup = BeautifulSoup(page, "html.parser")
 
         result_list = []
@@ -192,7 +199,6 @@ class TwitterSearch(GoogleSearch):
                     href=link['href'], title=title.text, description=description_box.text))
         if self.print_true:
             print(result_list)
-        time.sleep(5)
         return result_list
         
 
@@ -0,0 +1,101 @@
+import os
+import math
+import time
+import hashlib
+import sqlite3
+import threading
+
+
+class BloomFilter():
+    """Fixed-size Bloom filter of strings: no false negatives, about <error_rate> false positives up to <capacity> keys."""
+    def __init__(self, capacity: int = 1000000, error_rate: float = 0.01):
+        self.n_bits = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.n_hashes = max(1, round(self.n_bits / capacity * math.log(2)))
+        self._bits = bytearray((self.n_bits + 7) // 8)
+
+    def _positions(self, key: str):
+        # double hashing: the k positions are derived from the two halves of one digest
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.n_bits for i in range(self.n_hashes)]
+
+    def add(self, key: str):
+        for pos in self._positions(key):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+
+class NegativeCache():
+    """Persistent set of queries that returned no candidates, with a TTL.
+
+    Keys live in a SQLite file. An in-memory <BloomFilter> in front of it answers most lookups, the ones for keys
+    that were never added, without touching the file. The cache is safe to share between threads.
+    """
+    def __init__(self, path: str = 'source/negative_cache.sqlite', ttl: float = 30 * 24 * 3600, capacity: int = 1000000):
+        """
+        Parameters
+        ----------
+        path : path of the SQLite file, created if needed.
+        ttl : seconds after which a query is searched again. None keeps entries forever.
+        capacity : number of keys the Bloom filter is sized for; more keys only make it less selective.
+        """
+        self.path = path
+        self.ttl = ttl
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        if os.path.dirname(path) != '' and not os.path.exists(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('CREATE TABLE IF NOT EXISTS negatives (key TEXT PRIMARY KEY, created REAL NOT NULL)')
+        if ttl is not None:
+            self._conn.execute('DELETE FROM negatives WHERE created < ?', (time.time() - ttl,))
+        self._conn.commit()
+        self._bloom = BloomFilter(capacity=self.capacity)
+        for (key,) in self._conn.execute('SELECT key FROM negatives'):
+            self._bloom.add(key)
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM negatives').fetchone()[0]
+
+    def __contains__(self, key: str) -> bool:
+        """Whether <key> was added less than <self.ttl> seconds ago."""
+        with self._lock:
+            if key not in self._bloom:
+                self.misses += 1
+                return False
+            row = self._conn.execute('SELECT created FROM negatives WHERE key = ?', (key,)).fetchone()
+            if row is None or (self.ttl is not None and time.time() - row[0] > self.ttl):
+                self.misses += 1
+                return False
+            self.hits += 1
+            return True
+
+    def add(self, key: str):
+        """Record that <key> returned no candidates."""
+        with self._lock:
+            self._conn.execute('INSERT OR REPLACE INTO negatives (key, created) VALUES (?, ?)', (key, time.time()))
+            self._conn.commit()
+            self._bloom.add(key)
+
+    def discard(self, key: str):
+        """Forget <key>, e.g. once the scholar has created a profile."""
+        with self._lock:
+            self._conn.execute('DELETE FROM negatives WHERE key = ?', (key,))
+            self._conn.commit()
+
+    def clear(self):
+        """Remove every key."""
+        with self._lock:
+            self._conn.execute('DELETE FROM negatives')
+            self._conn.commit()
+            self._bloom = BloomFilter(capacity=self.capacity)
+
+    def close(self):
+        self._conn.close()
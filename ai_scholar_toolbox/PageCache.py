@@ -0,0 +1,97 @@
+import os
+import time
+import zlib
+import sqlite3
+import threading
+from typing import Optional
+
+
+class PageCache():
+    """Persistent cache of fetched html pages, stored zlib-compressed in a SQLite file.
+
+    Entries older than <ttl> seconds are treated as missing, and once the compressed pages exceed
+    <max_bytes> the least recently used ones are evicted. The cache is safe to share between threads.
+    """
+    def __init__(self, path: str = 'source/page_cache.sqlite', ttl: float = 7 * 24 * 3600, max_bytes: int = 1 << 30):
+        """
+        Parameters
+        ----------
+        path : path of the SQLite file, created if needed.
+        ttl : seconds after which a page is fetched again. None keeps pages forever.
+        max_bytes : upper bound of the total size of the compressed pages.
+        """
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        if os.path.dirname(path) != '' and not os.path.exists(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS pages ('
+            'key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, created REAL NOT NULL, accessed REAL NOT NULL)'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS pages_accessed ON pages (accessed)')
+        self._conn.commit()
+        self._size = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM pages').fetchone()[0]
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM pages').fetchone()[0]
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached page for <key>, or None if it is missing or expired."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute('SELECT value, created FROM pages WHERE key = ?', (key,)).fetchone()
+            if row is None or (self.ttl is not None and now - row[1] > self.ttl):
+                self.misses += 1
+                return None
+            self._conn.execute('UPDATE pages SET accessed = ? WHERE key = ?', (now, key))
+            self._conn.commit()
+            self.hits += 1
+        return zlib.decompress(row[0]).decode('utf-8')
+
+    def set(self, key: str, html: str):
+        """Store <html> under <key>, evicting old pages if the cache grows past <self.max_bytes>."""
+        value = zlib.compress(html.encode('utf-8'))
+        now = time.time()
+        with self._lock:
+            old = self._conn.execute('SELECT size FROM pages WHERE key = ?', (key,)).fetchone()
+            self._conn.execute(
+                'INSERT OR REPLACE INTO pages (key, value, size, created, accessed) VALUES (?, ?, ?, ?, ?)',
+                (key, value, len(value), now, now),
+            )
+            self._size += len(value) - (old[0] if old is not None else 0)
+            if self._size > self.max_bytes:
+                self._evict(now)
+            self._conn.commit()
+
+    def _evict(self, now: float):
+        # expired pages first, then the least recently used ones until we are back under 90% of the bound
+        if self.ttl is not None:
+            self._conn.execute('DELETE FROM pages WHERE created < ?', (now - self.ttl,))
+        self._size = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM pages').fetchone()[0]
+        target = int(self.max_bytes * 0.9)
+        while self._size > target:
+            rows = self._conn.execute('SELECT key, size FROM pages ORDER BY accessed LIMIT 100').fetchall()
+            if len(rows) == 0:
+                break
+            for key, size in rows:
+                if self._size <= target:
+                    break
+                self._conn.execute('DELETE FROM pages WHERE key = ?', (key,))
+                self._size -= size
+
+    def clear(self):
+        """Remove every page."""
+        with self._lock:
+            self._conn.execute('DELETE FROM pages')
+            self._conn.commit()
+            self._size = 0
+
+    def close(self):
+        self._conn.close()
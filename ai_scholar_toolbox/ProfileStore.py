@@ -0,0 +1,213 @@
+import os
+import json
+import zlib
+import sqlite3
+import threading
+from typing import Iterator, List, Tuple
+
+
+class ProfileStore():
+    """Persistent OpenReview id -> profile store in a SQLite file.
+
+    Profile dumps (`{"~First_Last1": {...}, ...}` json files) are ingested in a streaming fashion, so memory stays
+    flat whatever their size, and a file that was already ingested unchanged is skipped. Every profile remembers the
+    file it came from: <self.sync()> makes the store hold exactly the given files, and when several files have the
+    same id, the one given last wins, as with dict.update. Lookups behave like a read-only dict and load one profile
+    at a time. The store is safe to share between threads.
+    """
+    # bumped when the schema changes; an older file is emptied and filled again
+    VERSION = 1
+
+    def __init__(self, path: str = 'source/or_profiles.sqlite'):
+        """
+        Parameters
+        ----------
+        path : path of the SQLite file, created if needed.
+        """
+        self.path = path
+        if os.path.dirname(path) != '' and not os.path.exists(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        if self._conn.execute('PRAGMA user_version').fetchone()[0] != self.VERSION:
+            self._conn.execute('DROP TABLE IF EXISTS profiles')
+            self._conn.execute('DROP TABLE IF EXISTS sources')
+            self._conn.execute(f'PRAGMA user_version = {self.VERSION}')
+        self._conn.execute('CREATE TABLE IF NOT EXISTS profiles (id TEXT NOT NULL, source TEXT NOT NULL, value BLOB NOT NULL, PRIMARY KEY (id, source))')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS sources (path TEXT PRIMARY KEY, size INTEGER NOT NULL, mtime REAL NOT NULL, priority INTEGER NOT NULL)'
+        )
+        self._conn.commit()
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(DISTINCT id) FROM profiles').fetchone()[0]
+
+    def __contains__(self, or_id):
+        with self._lock:
+            return self._conn.execute('SELECT 1 FROM profiles WHERE id = ?', (or_id,)).fetchone() is not None
+
+    def __getitem__(self, or_id: str) -> dict:
+        profile = self.get(or_id)
+        if profile is None:
+            raise KeyError(or_id)
+        return profile
+
+    def get(self, or_id: str, default=None) -> dict:
+        """Return the profile of <or_id>, or <default> if it is not in the store."""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT profiles.value FROM profiles JOIN sources ON profiles.source = sources.path '
+                'WHERE profiles.id = ? ORDER BY sources.priority DESC LIMIT 1',
+                (or_id,),
+            ).fetchone()
+        if row is None:
+            return default
+        return json.loads(zlib.decompress(row[0]).decode('utf-8'))
+
+    def sources(self) -> List[str]:
+        """Absolute paths of the ingested files, from the lowest to the highest priority."""
+        with self._lock:
+            return [row[0] for row in self._conn.execute('SELECT path FROM sources ORDER BY priority')]
+
+    def sync(self, filepath_list: List[str]) -> int:
+        """Make the store hold exactly the profiles of <filepath_list>.
+
+        Files that changed since they were ingested are ingested again, and the profiles of files that are not in
+        the list any more are removed. Later files take precedence for ids present in several files.
+
+        Returns
+        -------
+        n_profiles : number of profiles read from the files that had to be (re-)ingested.
+        """
+        paths = [os.path.abspath(filepath) for filepath in filepath_list]
+        with self._lock:
+            stale = [row[0] for row in self._conn.execute('SELECT path FROM sources') if row[0] not in paths]
+            for path in stale:
+                self._conn.execute('DELETE FROM profiles WHERE source = ?', (path,))
+                self._conn.execute('DELETE FROM sources WHERE path = ?', (path,))
+            self._conn.commit()
+        n_profiles = 0
+        for priority, filepath in enumerate(filepath_list):
+            n_profiles += self.ingest(filepath, priority=priority)
+        return n_profiles
+
+    def ingest(self, filepath: str, batch_size: int = 1000, force: bool = False, priority: int = None) -> int:
+        """Add the profiles of a json dump to the store, replacing the ones previously read from the same file.
+
+        Parameters
+        ----------
+        filepath : path of a json file holding one object that maps OpenReview ids to profiles.
+        batch_size : number of profiles written per statement.
+        force : ingest the file even if it was already ingested and has not changed since.
+        priority : precedence of the file for ids present in several files. If not given, above every other file.
+
+        Returns
+        -------
+        n_profiles : number of profiles read from the file, 0 if it was skipped.
+        """
+        stat = os.stat(filepath)
+        source = os.path.abspath(filepath)
+        with self._lock:
+            if priority is None:
+                priority = self._conn.execute('SELECT COALESCE(MAX(priority), -1) + 1 FROM sources').fetchone()[0]
+            row = self._conn.execute('SELECT size, mtime FROM sources WHERE path = ?', (source,)).fetchone()
+            if not force and row is not None and row[0] == stat.st_size and row[1] == stat.st_mtime:
+                self._conn.execute('UPDATE sources SET priority = ? WHERE path = ?', (priority, source))
+                self._conn.commit()
+                return 0
+
+        n_profiles = 0
+        batch = []
+        insert = 'INSERT OR REPLACE INTO profiles (id, source, value) VALUES (?, ?, ?)'
+        with self._lock:
+            try:
+                # profiles dropped from a re-dumped file must not survive
+                self._conn.execute('DELETE FROM profiles WHERE source = ?', (source,))
+                for or_id, profile in iter_json_object(filepath):
+                    batch.append((or_id, source, zlib.compress(json.dumps(profile).encode('utf-8'))))
+                    if len(batch) >= batch_size:
+                        self._conn.executemany(insert, batch)
+                        n_profiles += len(batch)
+                        batch = []
+                self._conn.executemany(insert, batch)
+                n_profiles += len(batch)
+                # recorded in the same transaction, so an interrupted ingestion is redone from scratch
+                self._conn.execute(
+                    'INSERT OR REPLACE INTO sources (path, size, mtime, priority) VALUES (?, ?, ?, ?)',
+                    (source, stat.st_size, stat.st_mtime, priority),
+                )
+                self._conn.commit()
+            except BaseException:
+                self._conn.rollback()
+                raise
+        return n_profiles
+
+    def close(self):
+        self._conn.close()
+
+
+# characters that can follow a number in a json document
+_NUMBER_END = tuple(' \t\n\r,}]')
+
+
+def iter_json_object(filepath: str, chunk_size: int = 1 << 20) -> Iterator[Tuple[str, object]]:
+    """Yield the (key, value) pairs of the top-level json object in <filepath> without loading the whole file."""
+    decoder = json.JSONDecoder()
+    with open(filepath, encoding='utf-8') as file:
+        buf = ''
+        pos = 0
+        eof = False
+
+        def fill(pos):
+            # drop what was consumed and read at least one more chunk
+            nonlocal buf, eof
+            chunk = file.read(max(chunk_size, len(buf) - pos))
+            if chunk == '':
+                eof = True
+            buf = buf[pos:] + chunk
+            return 0
+
+        def skip_ws(pos):
+            while True:
+                while pos < len(buf) and buf[pos] in ' \t\n\r':
+                    pos += 1
+                if pos < len(buf) or eof:
+                    return pos
+                pos = fill(pos)
+
+        def decode(pos):
+            while True:
+                try:
+                    value, end = decoder.raw_decode(buf, pos)
+                    # a number is only complete once a delimiter follows it: "1.5" split after "1" decodes as 1
+                    if eof or not isinstance(value, (int, float)) or isinstance(value, bool) or buf[end:end + 1] in _NUMBER_END:
+                        return value, end
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                pos = fill(pos)
+
+        pos = skip_ws(pos)
+        if pos >= len(buf) or buf[pos] != '{':
+            raise ValueError(f'{filepath} does not hold a json object.')
+        pos = skip_ws(pos + 1)
+        if pos < len(buf) and buf[pos] == '}':
+            return
+        while True:
+            key, pos = decode(pos)
+            pos = skip_ws(pos)
+            if pos >= len(buf) or buf[pos] != ':':
+                raise ValueError(f'Expected ":" after key {key!r} in {filepath}.')
+            pos = skip_ws(pos + 1)
+            value, pos = decode(pos)
+            yield key, value
+            pos = skip_ws(pos)
+            if pos >= len(buf):
+                raise ValueError(f'Unexpected end of {filepath}.')
+            if buf[pos] == '}':
+                return
+            if buf[pos] != ',':
+                raise ValueError(f'Expected "," or "}}" after the value of {key!r} in {filepath}.')
+            pos = skip_ws(pos + 1)
@@ -0,0 +1,115 @@
+import time
+import threading
+from urllib.parse import urlsplit
+
+
+class RateLimiter():
+    """Token-bucket rate limiter keyed by host.
+
+    Every host gets a bucket that refills at `rate` requests per second and holds at most `burst` tokens.
+    When a host pushes back (HTTP 429, a CAPTCHA page), <self.backoff()> halves its rate and pauses it;
+    each <self.success()> afterwards brings the rate back up towards the configured one.
+    """
+    # requests per second and burst size per host
+    default_rates = {
+        'scholar.google.com': (0.5, 2),
+        'openreview.net': (5.0, 5),
+        'www.google.com': (0.5, 2),
+    }
+
+    def __init__(self, rates: dict = None, default_rate: float = 1.0, default_burst: int = 1, min_rate: float = 0.02, max_pause: float = 600):
+        """
+        Parameters
+        ----------
+        rates : host -> (rate, burst), updating <self.default_rates>.
+        default_rate : rate of hosts not listed in <rates>.
+        default_burst : burst of hosts not listed in <rates>.
+        min_rate : backoff never lowers a rate below this.
+        max_pause : longest pause (seconds) imposed by consecutive backoffs.
+        """
+        self.rates = dict(self.default_rates)
+        if rates is not None:
+            self.rates.update(rates)
+        self.default_rate = default_rate
+        self.default_burst = default_burst
+        self.min_rate = min_rate
+        self.max_pause = max_pause
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def set_rate(self, host: str, rate: float, burst: int = 1):
+        """Configure the rate of <host>, resetting any backoff on it."""
+        with self._lock:
+            self.rates[host] = (rate, burst)
+            self._buckets.pop(host, None)
+
+    def _bucket(self, host: str) -> dict:
+        if host not in self._buckets:
+            rate, burst = self.rates.get(host, (self.default_rate, self.default_burst))
+            self._buckets[host] = {
+                'rate': rate,
+                'base_rate': rate,
+                'burst': burst,
+                'tokens': float(burst),
+                'last': time.monotonic(),
+                'paused_until': 0.0,
+                'n_backoff': 0,
+            }
+        return self._buckets[host]
+
+    def wait(self, url: str) -> float:
+        """Block until a request to the host of <url> (or to the host <url> itself) is allowed.
+
+        Returns
+        -------
+        delay : seconds spent waiting.
+        """
+        host = _host(url)
+        with self._lock:
+            bucket = self._bucket(host)
+            now = time.monotonic()
+            bucket['tokens'] = min(bucket['burst'], bucket['tokens'] + (now - bucket['last']) * bucket['rate'])
+            bucket['last'] = now
+            # reserve a token now and sleep outside the lock, so concurrent callers queue up behind each other
+            bucket['tokens'] -= 1
+            delay = max(0.0, -bucket['tokens'] / bucket['rate'], bucket['paused_until'] - now)
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    def backoff(self, url: str, retry_after: float = None):
+        """Record that the host of <url> is throttling us: halve its rate and pause it.
+
+        Parameters
+        ----------
+        url : url or host that answered with 429 / a CAPTCHA.
+        retry_after : pause in seconds requested by the host (e.g. the Retry-After header). Otherwise the
+            pause grows exponentially with consecutive backoffs.
+        """
+        host = _host(url)
+        with self._lock:
+            bucket = self._bucket(host)
+            bucket['n_backoff'] += 1
+            bucket['rate'] = max(self.min_rate, bucket['rate'] / 2)
+            if retry_after is None:
+                retry_after = min(self.max_pause, 2 ** bucket['n_backoff'] / bucket['base_rate'])
+            bucket['paused_until'] = max(bucket['paused_until'], time.monotonic() + retry_after)
+            bucket['tokens'] = min(bucket['tokens'], 0.0)
+
+    def success(self, url: str):
+        """Record a successful request to the host of <url>, recovering its rate step by step."""
+        host = _host(url)
+        with self._lock:
+            bucket = self._bucket(host)
+            bucket['n_backoff'] = 0
+            bucket['rate'] = min(bucket['base_rate'], bucket['rate'] + bucket['base_rate'] / 10)
+
+
+def _host(url: str) -> str:
+    if '://' in url:
+        return urlsplit(url).hostname or url
+    return url
+
+
+# shared by every class of the package unless they are given their own limiter
+default_rate_limiter = RateLimiter()
@@ -0,0 +1,67 @@
+import copy
+import time
+import threading
+from collections import OrderedDict
+
+
+class ResultCache():
+    """Bounded in-process LRU cache with a TTL and hit / miss counters.
+
+    Values are deep-copied on the way in and out, so callers can modify what they get back.
+    """
+    def __init__(self, max_size: int = 1024, ttl: float = 600):
+        """
+        Parameters
+        ----------
+        max_size : maximum number of entries. 0 disables the cache.
+        ttl : seconds an entry stays valid. None keeps entries until they are evicted.
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return self.get(key, count=False) is not None
+
+    def get(self, key, count: bool = True):
+        """Return a copy of the value cached under <key>, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl is not None and time.monotonic() - entry[0] > self.ttl:
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                if count:
+                    self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            if count:
+                self.hits += 1
+        return copy.deepcopy(entry[1])
+
+    def set(self, key, value):
+        """Cache a copy of <value> under <key>, evicting the least recently used entries beyond <self.max_size>."""
+        if self.max_size <= 0:
+            return
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Remove every entry and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        return {'size': len(self._entries), 'hits': self.hits, 'misses': self.misses}
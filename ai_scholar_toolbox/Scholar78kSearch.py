@@ -1,18 +1,46 @@
-import pandas as pd
 import os
 import numpy as np
+from collections import defaultdict
 from typing import Union, List
+from .Scholar78kStore import Scholar78kStore
 
 
 class Scholar78kSearch():
-    def __init__(self):
+    # columns that stay in the on-disk store and are never loaded into <self.df>
+    heavy_columns = ['papers', 'co_authors_all']
+    # store index name -> attribute holding the index
+    _index_attrs = {
+        'name': '_name_index',
+        'first_token': '_first_token_index',
+        'token': '_token_index',
+        'gsid': '_gsid_index',
+    }
+
+    def __init__(self, shared: bool = False):
+        """
+        Parameters
+        ----------
+        shared : if True, attach read-only to the memory-mapped store and its published indexes (see
+            <self.publish_78kdata()>) instead of building a private DataFrame and private indexes. The
+            pages are then shared by every process on the host that attaches to the same store, and
+            <self.df> is None.
+        """
+        self.shared = shared
         self.get_78kdata()
+        if self.shared:
+            self.attach_indexes()
+        else:
+            self.build_name_index()
+            self.build_gsid_index()
         self.simple = False
         self.verbose = False
         self.print_true = True
 
     def get_78kdata(self, source='gdrive'):
         """Download and load the 78k dataset data.
+
+        The pickled dataset is converted once into a columnar, memory-mapped store (see <Scholar78kStore>)
+        next to it, and later runs open the store directly instead of unpickling the whole dataset.
         
         Parameters
         ----------
@@ -20,32 +48,91 @@ class Scholar78kSearch():
         """
         # path_name = 'gs_scholars_all.npy'
         path_name = 'gs_scholars_new.npy'
+        store_path = f'source/{os.path.splitext(path_name)[0]}'
         if source == 'gdrive':
-            import gdown
-            if not os.path.exists('source'):
-                os.mkdir('source')
-            if not os.path.exists(f'source/{path_name}'):
-                gdown.download(
-                    'https://self.drive.google.com/uc?id=1NTvn_HiGX3Lr0FtTw5ot3UxcdeNLsv7h',
-                    f'source/{path_name}'
-                )
-            self.df = pd.DataFrame.from_records(np.load(f'source/{path_name}', allow_pickle=True))
+            if not os.path.exists(store_path):
+                import gdown
+                if not os.path.exists('source'):
+                    os.mkdir('source')
+                if not os.path.exists(f'source/{path_name}'):
+                    gdown.download(
+                        'https://self.drive.google.com/uc?id=1NTvn_HiGX3Lr0FtTw5ot3UxcdeNLsv7h',
+                        f'source/{path_name}'
+                    )
+                print(f'[Info] Converting source/{path_name} into the columnar store {store_path} (one time only).')
+                Scholar78kStore.convert(np.load(f'source/{path_name}', allow_pickle=True), store_path)
+            self.store = Scholar78kStore(store_path)
+            if self.shared:
+                self.df = None
+            else:
+                self.df = self.store.to_dataframe(self._light_columns())
         else:
             raise NotImplementedError
     
-    def search_name(self, name: Union[str, list], query_dict: dict = None) -> List[dict]:
+    def search_name(self, name: Union[str, list], query_dict: dict = None, simple: bool = None) -> List[dict]:
         """Search scholar candidates given name in the 78k AI scholar dataset.
         
         Parameters
         ----------
         name : name of the scholar.
         query_dict : if this is given, the method will run <self._search_name_others_helper()>
+        simple : whether return simple information without paper list. If not given, <self.simple> is used.
 
         Returns
         -------
         df_row_list : a list of response dictionaries.
         
         """
+        name, name_list = self._split_name(name)
+        df_row_list = self._records(self._search_name_only_helper(name, name_list), simple=simple)
+        if len(df_row_list) > 0 and query_dict is not None:
+            df_row_list = self._search_name_others_helper(df_row_list, query_dict)
+        if self.print_true:
+            print(f'[Info] Found {len(df_row_list)} scholars are in 78k data.')
+            print(f'[Debug] Names: {[df_row_dict["name"] for df_row_dict in df_row_list]}')
+        if self.verbose:
+            print(df_row_list)
+        return df_row_list
+
+    def search_names(self, names: list, simple: bool = None) -> List[List[dict]]:
+        """Search scholar candidates for a batch of names in the 78k AI scholar dataset.
+
+        All names are resolved against the name indexes first, each distinct name once, and the matching rows are
+        materialized in a single pass over the dataset.
+
+        Parameters
+        ----------
+        names : list of names, each one as accepted by <self.search_name()>.
+        simple : whether return simple information without paper list. If not given, <self.simple> is used.
+
+        Returns
+        -------
+        df_row_lists : one list of response dictionaries per input name, in the order of <names>.
+
+        """
+        if type(names) is not list:
+            raise TypeError('Argument "names" passed to Scholar78kSearch.search_names has the wrong type.')
+        # batches often repeat a name (e.g. coauthors of several papers): resolve each normalized name once
+        resolved = {}
+        row_lists = []
+        for name in names:
+            name, name_list = self._split_name(name)
+            key = (_normalize_name(name), _normalize_token(name_list[0]), _normalize_token(name_list[-1]))
+            if key not in resolved:
+                resolved[key] = self._search_name_only_helper(name, name_list)
+            row_lists.append(resolved[key])
+        rows = np.concatenate(row_lists) if len(row_lists) > 0 else _no_rows
+        df_row_list = self._records(rows, simple=simple)
+        df_row_lists = []
+        start = 0
+        for name_rows in row_lists:
+            df_row_lists.append(df_row_list[start:start + len(name_rows)])
+            start += len(name_rows)
+        if self.print_true:
+            print(f'[Info] Found {len(df_row_list)} scholars in 78k data for {len(names)} names.')
+        return df_row_lists
+
+    def _split_name(self, name: Union[str, list]):
         if type(name) is list:
             name_list = [name[0], name[-1]]
             name = f'{name[0]} {name[-1]}' 
@@ -53,36 +140,140 @@ class Scholar78kSearch():
             name_list = name.split(' ')
         else:
             raise TypeError(f'Argument "name" passed to Scholar78kSearch.search_name has the wrong type.')
-        df_row = self._search_name_only_helper(name, name_list)
-        if df_row.shape[0] > 0 and query_dict is not None:
-            df_row = self._search_name_others_helper(df_row, query_dict)
-        if self.print_true:
-            print(f'[Info] Found {df_row.shape[0]} scholars are in 78k data.')
-            print(f'[Debug] Names: {df_row["name"]}')
-        if self.verbose:
-            print(df_row)
-        return self._deal_with_simple(df_row)
-        # return df_row
+        return name, name_list
 
-    def _deal_with_simple(self, df_row):
-        if self.simple:
-            df_row = df_row.loc[:, df_row.columns != 'papers']
-        df_row = df_row.drop(['co_authors_all'], axis=1)
-        return df_row.to_dict(orient='records')
+    def lookup_gsid(self, gs_sid: Union[str, list], simple: bool = None) -> List[dict]:
+        """Look up scholars in the 78k AI scholar dataset by gs_sid.
+
+        Parameters
+        ----------
+        gs_sid : a google scholar sid, or a list of them for bulk lookup.
+        simple : whether return simple information without paper list. If not given, <self.simple> is used.
+
+        Returns
+        -------
+        df_row_list : a list of response dictionaries in the order of <gs_sid>. Ids not in the dataset are skipped.
+
+        """
+        if type(gs_sid) is str:
+            gs_sid_list = [gs_sid]
+        elif type(gs_sid) is list:
+            gs_sid_list = gs_sid
+        else:
+            raise TypeError('Argument "gs_sid" passed to Scholar78kSearch.lookup_gsid has the wrong type.')
+        rows = [self._gsid_index[item] for item in gs_sid_list if item in self._gsid_index]
+        return self._records(rows, simple=simple)
+
+    def _records(self, rows, simple: bool = None) -> List[dict]:
+        """Response dicts for the given row ids, read from <self.df> or, in shared mode, from the store."""
+        if self.df is not None:
+            return self._deal_with_simple(self.df.iloc[rows], simple=simple)
+        return self._add_papers(self.store.records(rows, self._light_columns()), rows, simple=simple)
+
+    def _deal_with_simple(self, df_row, simple: bool = None):
+        """Convert rows of <self.df> to response dicts. Unless simple, the paper list of each row is read from the store."""
+        return self._add_papers(df_row.to_dict(orient='records'), df_row.index, simple=simple)
+
+    def _add_papers(self, df_row_list, rows, simple: bool = None):
+        # an explicit argument lets concurrent searches with different settings share this object
+        if simple is None:
+            simple = self.simple
+        if not simple and 'papers' in self.store.kinds:
+            for df_row_dict, row in zip(df_row_list, rows):
+                df_row_dict['papers'] = self.store.cell('papers', int(row))
+        return df_row_list
+
+    def _light_columns(self):
+        return [column for column in self.store.columns if column not in self.heavy_columns]
+
+    def build_name_index(self):
+        """Build the inverted name indexes used by <self._search_name_only_helper()>.
+
+        - `self._name_index`: normalized full name -> row ids.
+        - `self._first_token_index`: normalized first name token -> row ids.
+        - `self._token_index`: every other normalized name token -> row ids.
+        """
+        name_index = defaultdict(list)
+        first_token_index = defaultdict(list)
+        token_index = defaultdict(list)
+        for row, name in enumerate(self.store.column('name')):
+            if not isinstance(name, str):
+                continue
+            name_index[_normalize_name(name)].append(row)
+            tokens = name.split()
+            if len(tokens) == 0:
+                continue
+            first_token_index[_normalize_token(tokens[0])].append(row)
+            later_tokens = set()
+            for token in tokens[1:]:
+                later_tokens.add(_normalize_token(token))
+                later_tokens.update(_normalize_token(part) for part in token.split('-'))
+            for token in later_tokens:
+                token_index[token].append(row)
+        self._name_index = {key: np.array(rows, dtype=np.int64) for key, rows in name_index.items()}
+        self._first_token_index = {key: np.array(rows, dtype=np.int64) for key, rows in first_token_index.items()}
+        self._token_index = {key: np.array(rows, dtype=np.int64) for key, rows in token_index.items()}
+
+    def build_gsid_index(self):
+        """Build the gs_sid -> row id index used by <self.lookup_gsid()>."""
+        self._gsid_index = {}
+        for row, gs_sid in enumerate(self.store.column('gs_sid')):
+            if isinstance(gs_sid, str) and gs_sid not in self._gsid_index:
+                self._gsid_index[gs_sid] = row
+
+    def publish_78kdata(self):
+        """Write the name and gs_sid indexes into the store, so that other processes can attach
+        to the dataset with <Scholar78kSearch(shared=True)> without building their own copies.
+        """
+        for index_name, attr in self._index_attrs.items():
+            self.store.save_index(index_name, getattr(self, attr))
+
+    def attach_indexes(self):
+        """Memory-map the indexes published in the store, publishing them first if this is the first process to attach."""
+        if not all(self.store.has_index(index_name) for index_name in self._index_attrs):
+            print(f'[Info] Publishing the 78k indexes into {self.store.path}.')
+            self.build_name_index()
+            self.build_gsid_index()
+            self.publish_78kdata()
+        for index_name, attr in self._index_attrs.items():
+            setattr(self, attr, self.store.load_index(index_name))
 
     def _search_name_only_helper(self, name, name_list):
         """Helper function of search_name
 
         Returns
         -------
-        Boolean : found or not.
-        DataFrame : if find else None.
+        ndarray : row ids of scholars whose name is <name>, or whose first name is <name_list[0]> and one of whose
+            other name tokens is <name_list[-1]>, deduplicated by url.
         """
         # find the scholar in our dataset
-        name_df = self.df.loc[self.df['name'] == name].copy()
-        name_list_df = self.df.loc[self.df['name'].str.contains(pat = f'^{name_list[0].capitalize()} .*{name_list[-1].capitalize()}', regex=True, case=False)].copy()
-        return pd.concat([name_df, name_list_df]).drop_duplicates(subset=['url']).reset_index(drop=True)
+        name_rows = self._name_index.get(_normalize_name(name), _no_rows)
+        # a row is listed at most once per token, so the sort-and-unique pass of intersect1d can be skipped
+        name_list_rows = np.intersect1d(
+            self._first_token_index.get(_normalize_token(name_list[0]), _no_rows),
+            self._token_index.get(_normalize_token(name_list[-1]), _no_rows),
+            assume_unique=True,
+        )
+        rows = []
+        urls = set()
+        for row in np.concatenate([name_rows, name_list_rows]):
+            url = self.store.cell('url', int(row))
+            if url not in urls:
+                urls.add(url)
+                rows.append(row)
+        return np.array(rows, dtype=np.int64)
 
-    def _search_name_others_helper(self, df_row, query_dict):
+    def _search_name_others_helper(self, df_row_list, query_dict):
         # TODO: add a better filter more than by name
-        return df_row
\ No newline at end of file
+        return df_row_list
+
+
+_no_rows = np.zeros(0, dtype=np.int64)
+
+
+def _normalize_name(name: str) -> str:
+    return ' '.join(name.lower().split())
+
+
+def _normalize_token(token: str) -> str:
+    return token.lower().strip('.,;()[]"\'')
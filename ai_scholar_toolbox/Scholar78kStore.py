@@ -0,0 +1,237 @@
+import os
+import json
+import shutil
+import numpy as np
+from typing import Iterable, List
+
+
+class Scholar78kStore():
+    """Read-only, memory-mapped columnar copy of the 78k AI scholar dataset.
+
+    The store is a directory with one entry per column and a `meta.json` describing them:
+
+    - numeric columns are plain `<column>.npy` files, opened with `mmap_mode='r'`.
+    - string columns are a utf-8 blob `<column>.blob` (rows separated by `\\x00`) plus row offsets `<column>.offsets.npy`.
+    - any other column (lists, dicts, missing values) is a blob of one JSON document per row (separated by `\\n`) plus row offsets.
+
+    Nothing is unpickled, and a single row can be read without touching the rest of the column.
+    """
+    VERSION = 1
+    _separators = {'str': b'\x00', 'json': b'\n'}
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(os.path.join(path, 'meta.json')) as file:
+            meta = json.load(file)
+        if meta['version'] != self.VERSION:
+            raise ValueError(f'Unsupported 78k store version {meta["version"]} in {path}.')
+        self.n_rows = meta['n_rows']
+        self.kinds = {column['name']: column['kind'] for column in meta['columns']}
+        self.columns = [column['name'] for column in meta['columns']]
+        self._arrays = {}
+        self._offsets = {}
+        self._blobs = {}
+        for name, kind in self.kinds.items():
+            if kind == 'array':
+                self._arrays[name] = np.load(self._file(name, '.npy'), mmap_mode='r')
+            else:
+                self._offsets[name] = np.load(self._file(name, '.offsets.npy'), mmap_mode='r')
+                if os.path.getsize(self._file(name, '.blob')) > 0:
+                    self._blobs[name] = np.memmap(self._file(name, '.blob'), dtype=np.uint8, mode='r')
+                else:
+                    self._blobs[name] = np.zeros(0, dtype=np.uint8)
+
+    def __len__(self):
+        return self.n_rows
+
+    def _file(self, name: str, suffix: str) -> str:
+        return os.path.join(self.path, f'{_safe_name(name)}{suffix}')
+
+    @classmethod
+    def convert(cls, records: Iterable[dict], path: str) -> 'Scholar78kStore':
+        """Convert a list of scholar dicts (e.g. the pickled `gs_scholars_new.npy`) into a store at <path>.
+
+        Parameters
+        ----------
+        records : iterable of dicts, one per scholar.
+        path : output directory. It is written next to <path> first and moved into place once complete.
+
+        Returns
+        -------
+        store : the opened store.
+        """
+        records = list(records)
+        columns = []
+        for record in records:
+            for key in record:
+                if key not in columns:
+                    columns.append(key)
+        tmp_path = f'{path}.tmp'
+        if os.path.exists(tmp_path):
+            shutil.rmtree(tmp_path)
+        os.makedirs(tmp_path)
+        meta = {'version': cls.VERSION, 'n_rows': len(records), 'columns': []}
+        for name in columns:
+            values = [record.get(name) for record in records]
+            kind = _column_kind(values)
+            prefix = os.path.join(tmp_path, _safe_name(name))
+            if kind == 'array':
+                np.save(f'{prefix}.npy', np.asarray(values))
+            else:
+                if kind == 'str':
+                    encoded = [value.encode('utf-8') for value in values]
+                else:
+                    encoded = [json.dumps(value, default=_to_builtin).encode('utf-8') for value in values]
+                separator = cls._separators[kind]
+                offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+                np.cumsum([len(value) + 1 for value in encoded], out=offsets[1:])
+                with open(f'{prefix}.blob', 'wb') as file:
+                    for value in encoded:
+                        file.write(value)
+                        file.write(separator)
+                np.save(f'{prefix}.offsets.npy', offsets)
+            meta['columns'].append({'name': name, 'kind': kind})
+        with open(os.path.join(tmp_path, 'meta.json'), 'w') as file:
+            json.dump(meta, file)
+        if os.path.exists(path):
+            shutil.rmtree(path)
+        os.replace(tmp_path, path)
+        return cls(path)
+
+    def column(self, name: str) -> list:
+        """Decode a whole column into a list (or an array for numeric columns)."""
+        kind = self.kinds[name]
+        if kind == 'array':
+            return np.asarray(self._arrays[name])
+        if self.n_rows == 0:
+            return []
+        # every row is followed by its separator, so drop the last one before splitting
+        text = self._blobs[name][:-1].tobytes().decode('utf-8')
+        if kind == 'str':
+            return text.split('\x00')
+        return json.loads('[' + ','.join(text.split('\n')) + ']')
+
+    def cell(self, name: str, row: int):
+        """Read the value of column <name> at position <row>."""
+        kind = self.kinds[name]
+        if kind == 'array':
+            return self._arrays[name][row].item()
+        offsets = self._offsets[name]
+        start, end = int(offsets[row]), int(offsets[row + 1]) - 1
+        value = self._blobs[name][start:end].tobytes().decode('utf-8')
+        if kind == 'str':
+            return value
+        return json.loads(value)
+
+    def records(self, rows: Iterable[int], columns: List[str] = None) -> List[dict]:
+        """Read the given rows as dicts, restricted to <columns> if given."""
+        if columns is None:
+            columns = self.columns
+        return [{name: self.cell(name, int(row)) for name in columns} for row in rows]
+
+    def has_index(self, name: str) -> bool:
+        return os.path.exists(self._file(f'index_{name}', '.keys.npy'))
+
+    def save_index(self, name: str, index: dict):
+        """Persist a str -> row id(s) index next to the columns, so that it can be memory-mapped by <self.load_index()>.
+
+        Parameters
+        ----------
+        name : name of the index.
+        index : dict mapping each key either to a single row id or to an array of row ids.
+        """
+        keys = sorted(index)
+        prefix = self._file(f'index_{name}', '')
+        files = {'.keys.npy': np.array(keys, dtype=str)}
+        if len(keys) > 0 and all(isinstance(index[key], (int, np.integer)) for key in keys):
+            files['.rows.npy'] = np.array([index[key] for key in keys], dtype=np.int64)
+        else:
+            indptr = np.zeros(len(keys) + 1, dtype=np.int64)
+            np.cumsum([len(index[key]) for key in keys], out=indptr[1:])
+            files['.indptr.npy'] = indptr
+            files['.rows.npy'] = np.concatenate([np.asarray(index[key], dtype=np.int64) for key in keys]) if len(keys) > 0 else np.zeros(0, dtype=np.int64)
+        # several processes may publish the same index at once: write to private files and rename them into place,
+        # keys last since its presence is what marks the index as available
+        for suffix in sorted(files, key=lambda suffix: suffix == '.keys.npy'):
+            tmp_file = f'{prefix}.{os.getpid()}.tmp{suffix}'
+            np.save(tmp_file, files[suffix])
+            os.replace(tmp_file, f'{prefix}{suffix}')
+
+    def load_index(self, name: str) -> 'Scholar78kIndex':
+        """Memory-map an index written by <self.save_index()>."""
+        prefix = self._file(f'index_{name}', '')
+        indptr = None
+        if os.path.exists(f'{prefix}.indptr.npy'):
+            indptr = np.load(f'{prefix}.indptr.npy', mmap_mode='r')
+        return Scholar78kIndex(
+            np.load(f'{prefix}.keys.npy', mmap_mode='r'),
+            np.load(f'{prefix}.rows.npy', mmap_mode='r'),
+            indptr,
+        )
+
+    def to_dataframe(self, columns: List[str] = None):
+        """Materialize the store (or a subset of its columns) as a pandas DataFrame."""
+        import pandas as pd
+        if columns is None:
+            columns = self.columns
+        return pd.DataFrame({name: self.column(name) for name in columns}, columns=columns)
+
+
+class Scholar78kIndex():
+    """Read-only str -> row id(s) mapping backed by sorted, memory-mapped arrays.
+
+    It supports the dict methods used by <Scholar78kSearch>, so it can stand in for the in-process dict indexes.
+    """
+    def __init__(self, keys: np.ndarray, rows: np.ndarray, indptr: np.ndarray = None):
+        self.keys = keys
+        self.rows = rows
+        self.indptr = indptr
+
+    def _find(self, key):
+        if not isinstance(key, str):
+            return None
+        idx = int(np.searchsorted(self.keys, key))
+        if idx < len(self.keys) and self.keys[idx] == key:
+            return idx
+        return None
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __contains__(self, key):
+        return self._find(key) is not None
+
+    def __getitem__(self, key):
+        idx = self._find(key)
+        if idx is None:
+            raise KeyError(key)
+        if self.indptr is None:
+            return int(self.rows[idx])
+        return np.asarray(self.rows[self.indptr[idx]:self.indptr[idx + 1]])
+
+    def get(self, key, default=None):
+        if key in self:
+            return self[key]
+        return default
+
+
+def _column_kind(values: list) -> str:
+    if len(values) > 0 and all(type(value) is str and '\x00' not in value for value in values):
+        return 'str'
+    if len(values) > 0 and all(isinstance(value, (int, float, np.integer, np.floating)) and not isinstance(value, (bool, np.bool_)) for value in values):
+        return 'array'
+    return 'json'
+
+
+def _to_builtin(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, (set, tuple)):
+        return list(value)
+    raise TypeError(f'Object of type {type(value).__name__} cannot be stored in the 78k store.')
+
+
+def _safe_name(name: str) -> str:
+    return ''.join(c if c.isalnum() or c in '-_' else '_' for c in str(name))
@@ -1,35 +1,136 @@
 import re
-import time
-from typing import Union
-from selenium import webdriver
-from selenium.webdriver.chrome.options import ChromiumOptions
-from selenium.webdriver.chromium.webdriver import ChromiumDriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.remote.errorhandler import NoSuchElementException
+import itertools
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, Optional, Union, TYPE_CHECKING
+from urllib.parse import urlsplit, parse_qs
+from . import gs_parser
+from .PageCache import PageCache
+from .RateLimiter import RateLimiter, default_rate_limiter
+from .SnapshotStore import SnapshotStore
+from .WebDriverPool import WebDriverPool
+if TYPE_CHECKING:
+    from selenium.webdriver.chromium.webdriver import ChromiumDriver
 
 
 class ScholarGsSearch():
     """Class that handling searching on Google Scholar webpage using REST GET API."""
-    def __init__(self, driver_path):
+    def __init__(self, driver_path, backend: str = 'webdriver', rate_limiter: RateLimiter = None, pool_size: int = 1, page_cache: PageCache = None, snapshot_store: SnapshotStore = None):
+        """
+        Parameters
+        ----------
+        driver_path : path of the browser driver. Not used by the 'http' backend.
+        backend : 'webdriver' drives headless Chrome; 'http' fetches the static pages with a pooled
+            requests.Session and parses them in-process, without a browser.
+        rate_limiter : paces the page loads per host. If not given, the package-wide limiter is used.
+        pool_size : number of browsers ('webdriver') or http connections ('http') used for concurrent page loads.
+        page_cache : if given, profile and author-search pages are read from / written to this cache.
+        snapshot_store : if given, full profiles (simple=False) are saved to it, and <self.refresh_gsid()> updates them incrementally.
+        """
         self._authsearch = 'https://scholar.google.com/citations?hl=en&view_op=search_authors&mauthors={0}'
         self._gsidsearch = 'https://scholar.google.com/citations?hl=en&user={0}'
         self.print_true = False
-        self.setup_webdriver(driver_path)
-
-    def setup_webdriver(self, driver_path):
-        """Setup the webdriver object."""
-        options = ChromiumOptions()
-        options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        options.add_experimental_option('useAutomationExtension', False)
-        options.add_argument('--headless')
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-
-        self.driver = webdriver.Chrome(driver_path, options=options)
-        self.driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {
-            "source": "Object.defineProperty(navigator, 'webdriver', {get: () => undefined})"
-        })
+        self.backend = backend
+        self.rate_limiter = rate_limiter if rate_limiter is not None else default_rate_limiter
+        self.page_cache = page_cache
+        self.snapshot_store = snapshot_store
+        # issue the fallback author-search queries of <self.search_name()> concurrently rather than one after another
+        self.speculative_search = True
+        # number of times a throttled (429 / CAPTCHA) page is retried after backing off
+        self.max_retries = 3
+        if backend == 'webdriver':
+            self.setup_webdriver(driver_path, pool_size=pool_size)
+        elif backend == 'http':
+            self.setup_session(pool_size=pool_size)
+        else:
+            raise ValueError(f'Unknown backend "{backend}" passed to ScholarGsSearch, must be "webdriver" or "http".')
+
+    def setup_webdriver(self, driver_path, pool_size: int = 1):
+        """Setup the pool of webdriver objects."""
+        self.driver_pool = WebDriverPool(driver_path, size=pool_size)
+        # kept for code that drives the browser directly; page loads of this class go through the pool
+        self.driver = self.driver_pool.drivers[0]
+        self.n_workers = pool_size
     
+    def setup_session(self, pool_size: int = 10, timeout: float = 30):
+        """Setup the pooled http session used by the 'http' backend."""
+        import requests
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.headers.update({
+            'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+            'Accept-Language': 'en-US,en;q=0.9',
+        })
+        self.timeout = timeout
+        self.n_workers = pool_size
+
+    def get_page(self, url: str, driver: 'ChromiumDriver' = None, use_cache: bool = True) -> Optional[str]:
+        """Load <url> with the configured backend and return its html.
+
+        Page loads are paced by <self.rate_limiter>. When Google Scholar answers with 429, a CAPTCHA page or a
+        server error, the host is backed off and the page is retried up to <self.max_retries> times. With the 'http'
+        backend, a page that does not exist (404 and the other client errors, e.g. for a deleted gs_sid) returns None.
+
+        Parameters
+        ----------
+        url : url of the page.
+        driver : with the 'webdriver' backend, the driver to load the page in. If not given, one is checked out of the pool for the call.
+        use_cache : whether <self.page_cache> may answer instead of loading the page.
+        """
+        cache_key = None
+        if use_cache and self.page_cache is not None:
+            cache_key = self._cache_key(url)
+            html = self.page_cache.get(cache_key)
+            if html is not None:
+                return html
+        if self.backend == 'webdriver' and driver is None:
+            with self.driver_pool.driver() as driver:
+                return self._load_page(url, driver, cache_key)
+        return self._load_page(url, driver, cache_key)
+
+    def _load_page(self, url: str, driver: 'ChromiumDriver', cache_key: str = None) -> Optional[str]:
+        """Helper function of <self.get_page()>: load <url> past throttling and store it in the cache under <cache_key>."""
+        for _ in range(self.max_retries + 1):
+            self.rate_limiter.wait(url)
+            retry_after = None
+            if self.backend == 'http':
+                response = self.session.get(url, timeout=self.timeout)
+                html = response.text
+                if response.status_code == 429:
+                    retry_after = response.headers.get('Retry-After')
+                    retry_after = float(retry_after) if retry_after is not None and retry_after.isdigit() else None
+                    html = None
+                elif response.status_code >= 400 and not gs_parser.is_blocked(html):
+                    if response.status_code < 500:
+                        # not a throttling answer: there is no such page, as the browser would have shown
+                        self.rate_limiter.success(url)
+                        return None
+                    # server errors are usually transient
+                    html = None
+            else:
+                driver.get(url)
+                html = driver.page_source
+            if html is None or gs_parser.is_blocked(html):
+                if self.print_true:
+                    print(f'[Info] Throttled or failed while loading {url}, backing off.')
+                self.rate_limiter.backoff(url, retry_after)
+                continue
+            self.rate_limiter.success(url)
+            if cache_key is not None:
+                self.page_cache.set(cache_key, html)
+            return html
+        raise RuntimeError(f'[Error] Still throttled or failing after {self.max_retries} retries: {url}')
+
+    def _cache_key(self, url: str) -> str:
+        """Key of <url> in <self.page_cache>: the gs_sid for profile pages, the normalized query for author searches."""
+        query = parse_qs(urlsplit(url).query)
+        if 'mauthors' in query:
+            return 'search:' + ' '.join(query['mauthors'][0].lower().split())
+        if 'user' in query:
+            return ':'.join([f'profile:{query["user"][0][:12]}'] + [f'{param}={query[param][0]}' for param in ('cstart', 'pagesize', 'sortby') if param in query])
+        return url
+
     def change_name(self, name):
         new_name = name[1:].split('_')
         new_name[-1] = re.sub(r'[0-9]+', '', new_name[-1])
@@ -50,9 +151,7 @@ class ScholarGsSearch():
         
         """
         url = self._gsidsearch.format(gs_sid)
-        self.driver.get(url)
-        scholar_dict = self._search_gsid_helper(self.driver, url, simple=simple)
-        time.sleep(5)
+        scholar_dict = self.fetch_profile(url, simple=simple)
         if scholar_dict is not None:
             
             return [scholar_dict]
@@ -61,88 +160,142 @@ class ScholarGsSearch():
                 print('[Info] No scholars found given gs_sid in search_gs.')
             return []
         
-    def _search_gsid_helper(self, driver: ChromiumDriver, url: str, simple: bool = True):
-        """Helper function for search_gsid."""
-
-        def get_single_author(element):
-            li=[]
-            li.append(element.find_elements(By.TAG_NAME, "a")[0].get_attribute('href'))
-            li.append(element.find_elements(By.TAG_NAME, "a")[0].get_attribute('textContent'))
-            for i in element.find_elements(By.CLASS_NAME, "gsc_rsb_a_ext"):
-                li.append(i.get_attribute('textContent'))
-            return li
-
-        html_first_class = driver.find_elements(By.CLASS_NAME, "gsc_g_hist_wrp")
-        if (len(html_first_class)==0):
-            if self.print_true:
-                print("[Info] len(html_first_class)==0")
+    def fetch_profile(self, url: str, simple: bool = True, pagesize: int = 100):
+        """Load the profile page at <url> with the configured backend and parse it.
+
+        Without <simple>, the first page of the paper list (`cstart=0&pagesize=<pagesize>`) is loaded as the profile
+        page, since it has the same header, so a scholar with fewer than <pagesize> papers costs a single page load.
+
+        Returns
+        -------
+        scholar_dict : dict of the scholar, None if the page is not a valid profile.
+        """
+        html = self.get_page(url if simple else f'{url}&cstart=0&pagesize={pagesize}')
+        if html is None:
             return None
-        idx_list = html_first_class[0].find_elements(By.CLASS_NAME, "gsc_md_hist_b")[0]
-        years =  [i.get_attribute('textContent') for i in idx_list.find_elements(By.CLASS_NAME, "gsc_g_t")]
-        cites =  [i.get_attribute('innerHTML') for i in idx_list.find_elements(By.CLASS_NAME, "gsc_g_al")]
-        rsb = driver.find_elements(By.CLASS_NAME, "gsc_rsb")[0]
-        Citations_table=[i.get_attribute('textContent') for i in  rsb.find_elements(By.CLASS_NAME, "gsc_rsb_std")]
-        Co_authors = rsb.find_elements(By.CLASS_NAME, "gsc_rsb_a")
-        if len(Co_authors) == 0:
-            Co_authors = None
-        else:
-            Co_authors = [get_single_author(i) for i in rsb.find_element(By.CLASS_NAME, "gsc_rsb_a").find_elements(By.CLASS_NAME, "gsc_rsb_a_desc")]
-
-        Researcher = {"url": url}
-        gs_sid = None
-        if 'user=' in url:
-            tmp_gs_sid = url.split('user=', 1)[1]
-            if len(tmp_gs_sid) >= 12:
-                gs_sid = tmp_gs_sid[:12]
-        Researcher['gs_sid'] = gs_sid
-        Researcher["coauthors"] = Co_authors
-        Researcher["citation_table"] = [Citations_table[0], Citations_table[2]]
-        Researcher["cites"] = {"years":years, "cites":cites}
-        nameList = driver.find_elements(By.ID, "gsc_prf_in")
-        if (len(nameList) != 1):
+        scholar_dict = gs_parser.parse_profile(html, url, simple=simple)
+        if scholar_dict is not None and not simple:
+            if len(scholar_dict['papers']) >= pagesize:
+                scholar_dict['papers'] += list(self.iter_papers(scholar_dict['gs_sid'], pagesize=pagesize, cstart=pagesize))
+            if self.snapshot_store is not None and scholar_dict['gs_sid'] is not None:
+                self.snapshot_store.set(scholar_dict['gs_sid'], scholar_dict)
+        return scholar_dict
+
+    def refresh_gsid(self, gs_sid: str, pagesize: int = 100) -> dict:
+        """Bring the snapshot of <gs_sid> in <self.snapshot_store> up to date, fetching only what changed.
+
+        The profile page is reloaded (citation table, co-authors, ...) and the paper list is read newest first
+        (`sortby=pubdate`) until the first known paper that is older than the latest year in the snapshot. New papers
+        are added, and the citation counts of the known papers on those pages are updated; the counts of older papers
+        are kept from the snapshot. Without a snapshot, the full profile is fetched.
+
+        Parameters
+        ----------
+        gs_sid : google scholar sid.
+        pagesize : rows per page of the paper list.
+
+        Returns
+        -------
+        scholar_dict : the refreshed dict of the scholar (with papers), None if the profile could not be loaded.
+        """
+        if self.snapshot_store is None:
+            raise ValueError('ScholarGsSearch.refresh_gsid needs a snapshot_store.')
+        url = self._gsidsearch.format(gs_sid)
+        snapshot = self.snapshot_store.get(gs_sid)
+        if snapshot is None or snapshot.get('papers') is None:
+            return self.fetch_profile(url, simple=False, pagesize=pagesize)
+
+        # the first page of the newest papers doubles as the profile page
+        html = self.get_page(f'{url}&sortby=pubdate&cstart=0&pagesize={pagesize}', use_cache=False)
+        scholar_dict = gs_parser.parse_profile(html, url, simple=False) if html is not None else None
+        if scholar_dict is None:
+            return None
+        first_page = scholar_dict['papers']
+        later_pages = self.iter_papers(gs_sid, pagesize=pagesize, prefetch=0, sortby='pubdate', use_cache=False, cstart=pagesize)
+        # papers are identified by their `citation_for_view` url
+        known = {paper[0]: idx for idx, paper in enumerate(snapshot['papers'])}
+        latest_year = max((_year(paper) for paper in snapshot['papers']), default=0)
+        papers = list(snapshot['papers'])
+        new_papers = []
+        for paper in itertools.chain(first_page, later_pages if len(first_page) >= pagesize else []):
+            if paper[0] not in known:
+                new_papers.append(paper)
+                continue
+            papers[known[paper[0]]] = paper
+            if _year(paper) < latest_year:
+                break
+        scholar_dict['papers'] = new_papers + papers
+        self.snapshot_store.set(gs_sid, scholar_dict)
+        if self.print_true:
+            print(f'[Info] Found {len(new_papers)} new papers of {gs_sid}.')
+        return scholar_dict
+
+    def fetch_profiles(self, urls: list, simple: bool = True) -> list:
+        """Run <self.fetch_profile()> over <urls> with up to <self.n_workers> page loads at once.
+
+        Returns
+        -------
+        scholar_dict_list : one dict (or None) per url, in the order of <urls>.
+        """
+        if len(urls) <= 1 or self.n_workers <= 1:
+            return [self.fetch_profile(url, simple=simple) for url in urls]
+        with ThreadPoolExecutor(max_workers=min(self.n_workers, len(urls))) as executor:
+            return list(executor.map(lambda url: self.fetch_profile(url, simple=simple), urls))
+
+    def iter_papers(self, gs_sid: str, pagesize: int = 100, prefetch: int = 1, sortby: str = None, use_cache: bool = True, cstart: int = 0) -> Iterator[list]:
+        """Yield the paper rows of <gs_sid> as the pages of the paginated profile endpoint (`cstart` / `pagesize`) arrive.
+
+        The first page is loaded alone, most scholars having a single page. Once a page comes back full, the next
+        <prefetch> pages are loaded while it is consumed. Works with both backends.
+
+        Parameters
+        ----------
+        gs_sid : google scholar sid.
+        pagesize : rows per page; Google Scholar serves at most 100.
+        prefetch : number of pages requested ahead of the one being consumed.
+        sortby : 'pubdate' lists the newest papers first. If not given, papers come in Google Scholar's default (citations) order.
+        use_cache : whether <self.page_cache> may answer instead of loading the pages.
+        cstart : index of the first paper, e.g. <pagesize> when the first page was already loaded with the profile.
+        """
+        url = self._gsidsearch.format(gs_sid) + (f'&sortby={sortby}' if sortby is not None else '')
+
+        def get_papers(cstart):
+            html = self.get_page(f'{url}&cstart={cstart}&pagesize={pagesize}', use_cache=use_cache)
+            return gs_parser.parse_papers(html) if html is not None else []
+
+        with ThreadPoolExecutor(max_workers=prefetch + 1) as executor:
+            futures = deque([executor.submit(get_papers, cstart)])
+            cstart += pagesize
+            while len(futures) > 0:
+                page = futures.popleft().result()
+                yield from page
+                if len(page) < pagesize:
+                    # last page: the pages requested ahead are past the end
+                    for future in futures:
+                        future.cancel()
+                    return
+                while len(futures) < prefetch + 1:
+                    futures.append(executor.submit(get_papers, cstart))
+                    cstart += pagesize
+
+    def _search_authors(self, url: str, name_list: list):
+        """Load the author-search page at <url> with the configured backend and parse it."""
+        html = self.get_page(url)
+        return gs_parser.parse_search_results(html, name_list) if html is not None else []
+
+    def _search_gsid_helper(self, driver: 'ChromiumDriver', url: str, simple: bool = True):
+        """Helper function for search_gsid.
+
+        The page is read with a single `driver.page_source` call and parsed in-process by <gs_parser.parse_profile()>.
+        The full paper list is fetched page by page with <self.iter_papers()> rather than by expanding it in the browser.
+        """
+        Researcher = gs_parser.parse_profile(driver.page_source, url, simple=True)
+        if Researcher is None:
             if self.print_true:
-                print("len(nameList)!=1")
+                print('[Info] No valid profile found in the page.')
             return None
-        Researcher["name"] = nameList[0].text
-        infoList = driver.find_elements(By.CLASS_NAME, 'gsc_prf_il')
-        Researcher['organization'] = infoList[0].get_attribute('textContent')
-        Researcher['domain_labels'] = [i.get_attribute('textContent').strip().lower() for i in infoList[2].find_elements(By.CLASS_NAME, 'gsc_prf_inta')]
         if not simple:
-            button = driver.find_elements(By.CLASS_NAME, 'gs_btnPD')
-            if (len(button) != 1):
-                if self.print_true:
-                    print("len(button)!=1")
-                return None
-            while (button[0].is_enabled()):
-                while (button[0].is_enabled()):
-                    while (button[0].is_enabled()):
-                        button[0].click()
-                        time.sleep(5)
-                    time.sleep(1)
-                time.sleep(2)
-            papers = []
-            items = driver.find_elements(By.CLASS_NAME, 'gsc_a_tr')
-            for i in items:
-                item = i.find_element(By.CLASS_NAME, 'gsc_a_at')
-                url = item.get_attribute("href")
-                paper_info=[j.text for j in i.find_elements(By.CLASS_NAME, 'gs_gray')]
-                cite = i.find_element(By.CLASS_NAME, 'gsc_a_ac')
-                year = i.find_element(By.CLASS_NAME, 'gsc_a_y').find_element(By.CLASS_NAME, "gsc_a_h").text
-                papers.append([url, item.text, 
-                                paper_info,
-                            cite.text, cite.get_attribute("href"),
-                            year])
-            Researcher["papers"] = papers
-
-        def generate_single_coauthor(element):
-            coauthor_dict = {
-                "name":element.find_elements(By.CLASS_NAME, 'gs_ai_name')[0].get_attribute('textContent'),
-                "url":element.find_elements(By.CLASS_NAME, 'gs_ai_pho')[0].get_attribute('href'),
-                "description":element.get_attribute('innerHTML'),
-            }
-            return coauthor_dict
-        extra_coauthors = driver.find_elements(By.CLASS_NAME, "gsc_ucoar")
-        Researcher['extra_co_authors'] = [generate_single_coauthor(i) for i in extra_coauthors]
+            Researcher['papers'] = list(self.iter_papers(Researcher['gs_sid']))
         return Researcher
 
     def search_name(self, name: Union[str, list], query_dict: dict = None, top_n=3, simple=True):
@@ -160,7 +313,7 @@ class ScholarGsSearch():
         resp : list of candidate scholars, empty if no candidates are found.
 
         """
-        from ScholarSearch import generate_or_keyword_list
+        from .ScholarSearch import generate_or_keyword_list
         if type(name) is list:
             # current case
             name_list = [name[0], name[-1]]
@@ -170,6 +323,8 @@ class ScholarGsSearch():
         else:
             raise TypeError('Argument "name" passed to ScholarGsSearch.search_name has the wrong type.')
         url_fragment = f'{name} '
+        # tiers of queries in priority order: (step, url, whether the number of results must be <= top_n)
+        tiers = []
         if query_dict is not None:
             # first try (name, email_suffix, position, organization) as url
             keyword_list = generate_or_keyword_list(query_dict)[0]
@@ -181,129 +336,56 @@ class ScholarGsSearch():
             # if 'organization' in keyword_list:
             #     url_fragment_new = url_fragment_new + keyword_list['organization'] + ' '
 
-            # url = self._authsearch.format(url_fragment_new)
-            # self.driver.get(url)
-            # time.sleep(5)
-            # scholar_list = self._search_name_helper(self.driver, name_list)
-            # if len(scholar_list) > 0:
-            #     if wo_full:
-            #         return scholar_list
-            #     else:
-            #         return self._search_name_list_expand(scholar_list, simple=simple)
-            
-            # second try (name, email_suffix)
-            if 'email_suffix' in keyword_list:
-                url_fragment_new = url_fragment + keyword_list['email_suffix'] # + ' '
-            url = self._authsearch.format(url_fragment_new)
-            self.driver.get(url)
-            time.sleep(5)
-            scholar_list = self._search_name_helper(self.driver, name_list)
-            # return scholar_list
-            if len(scholar_list) > 0:
-                if self.print_true:
-                    print(f'[Info] Find {len(scholar_list)} scholars using query without gs_sid in step 1.')
-                # return self._search_name_list_expand(scholar_list, simple=simple)
-                return scholar_list
-        
-            # third try (name, position)
-            if 'position' in keyword_list:
-                url_fragment_new = url_fragment + keyword_list['position'] # + ' '
-            url = self._authsearch.format(url_fragment_new)
-            self.driver.get(url)
-            time.sleep(5)
-            scholar_list = self._search_name_helper(self.driver, name_list)
-            # return scholar_list
-            if len(scholar_list) > 0:
-                if self.print_true:
-                    print(f'[Info] Find {len(scholar_list)} scholars using query without gs_sid in step 2.')
-                # return self._search_name_list_expand(scholar_list, simple=simple)
-                return scholar_list
-
-            # fourth try (name, organization)
-            if 'organization' in keyword_list:
-                url_fragment_new = url_fragment + keyword_list['organization'] # + ' '
-            url = self._authsearch.format(url_fragment_new)
-            self.driver.get(url)
-            time.sleep(5)
-            scholar_list = self._search_name_helper(self.driver, name_list)
-            # return scholar_list
-            if len(scholar_list) > 0:
-                if self.print_true:
-                    print(f'[Info] Find {len(scholar_list)} scholars using query without gs_sid in step 3.')
-                # return self._search_name_list_expand(scholar_list, simple=simple)
-                return scholar_list
+            # second try (name, email_suffix), third try (name, position), fourth try (name, organization).
+            # A missing keyword keeps the previous query.
+            for step, keyword in enumerate(['email_suffix', 'position', 'organization'], 1):
+                if keyword in keyword_list:
+                    url_fragment_new = url_fragment + keyword_list[keyword] # + ' '
+                tiers.append((step, self._authsearch.format(url_fragment_new), False))
 
         # finally, only search (name: firstname and lastname). If only one response returns, mark it as candidate
-        url = self._authsearch.format(url_fragment)
-        self.driver.get(url)
-        time.sleep(5)
-        scholar_list = self._search_name_helper(self.driver, name_list)
-        if len(scholar_list) > 0 and len(scholar_list) <= top_n:
-            if self.print_true:
-                print(f'[Info] Find {len(scholar_list)} scholars using query without gs_sid in step 4.')
-            # return self._search_name_list_expand(scholar_list, simple=simple)
-            return scholar_list
-        
+        tiers.append((4, self._authsearch.format(url_fragment), True))
+
+        # a url repeated by a later tier returns the same results, which did not satisfy the earlier tier
+        urls = set()
+        distinct_tiers = []
+        for tier in tiers:
+            if tier[1] not in urls:
+                urls.add(tier[1])
+                distinct_tiers.append(tier)
+        tiers = distinct_tiers
+
+        # load the tiers <self.n_workers> at a time (one by one without <self.speculative_search>) and take the first
+        # that matches; the tiers still queued when a higher one matches are never loaded
+        n_workers = max(1, min(len(tiers), self.n_workers)) if self.speculative_search else 1
+        executor = ThreadPoolExecutor(max_workers=n_workers)
+        futures = [executor.submit(self._search_authors, url, name_list) for _, url, _ in tiers]
+        try:
+            for (step, _, check_top_n), future in zip(tiers, futures):
+                scholar_list = future.result()
+                if len(scholar_list) > 0 and (not check_top_n or len(scholar_list) <= top_n):
+                    if self.print_true:
+                        print(f'[Info] Find {len(scholar_list)} scholars using query without gs_sid in step {step}.')
+                    # return self._search_name_list_expand(scholar_list, simple=simple)
+                    return scholar_list
+        finally:
+            # lower tiers that are not needed any more are dropped if they have not started
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=False)
         return []
 
     def _search_name_helper(self, driver, name_list):
-        """Helper function of <self.search_name()>."""
+        """Helper function of <self.search_name()>. The result page is parsed in-process by <gs_parser.parse_search_results()>."""
         # iterate over searched list, find dicts that contains the name (including)
-        useful_info_list = driver.find_elements(By.CLASS_NAME, 'gs_ai_t')
-        useful_info_ext_list = []
-        if len(useful_info_list) != 0:
-            for scholar_webdriver in useful_info_list:
-                name = scholar_webdriver.find_element(By.CLASS_NAME, 'gs_ai_name').get_attribute('textContent').strip()
-                # check whether name is correct
-                not_a_candidate = False
-                for name_fragment in name_list:
-                    if name_fragment.lower() not in name.lower():
-                        not_a_candidate = True
-                        break
-                if not_a_candidate:
-                    continue
-                
-                # grab all the other information
-                pos_org = scholar_webdriver.find_element(By.CLASS_NAME, 'gs_ai_aff').get_attribute('textContent').strip()
-                email_str = scholar_webdriver.find_element(By.CLASS_NAME, 'gs_ai_eml').get_attribute('textContent').strip()
-                cite = scholar_webdriver.find_element(By.CLASS_NAME, 'gs_ai_cby').get_attribute('textContent').strip()
-                url = scholar_webdriver.find_element(By.CLASS_NAME, 'gs_ai_name').find_element(By.TAG_NAME, 'a').get_attribute('href').strip()
-                domain_labels = scholar_webdriver.find_element(By.CLASS_NAME, 'gs_ai_int').find_elements(By.CLASS_NAME, 'gs_ai_ont_int')
-                for idx, domain in enumerate(domain_labels):
-                    domain_labels[idx] = domain.get_attribute('textContent').strip().lower()
-
-                # continue processing
-                gs_sid = None
-                if 'user=' in url:
-                    tmp_gs_sid = url.split('user=', 1)[1]
-                    if len(tmp_gs_sid) >= 12:
-                        gs_sid = tmp_gs_sid[:12]
-
-                if email_str is not None and email_str != '':
-                    match = re.search(r'[\w-]+\.[\w.-]+', email_str)
-                    email_str = match.group(0)
-
-                cites = [int(s) for s in cite.split() if s.isdigit()]
-                useful_info_ext_list.append({
-                    'name': name,
-                    'pos_org': pos_org,
-                    'email': email_str,
-                    'cite': cites[0] if len(cites)>0 else None,
-                    'url': url,
-                    'gs_sid': gs_sid,
-                    'domain_labels': domain_labels
-                })
-        return useful_info_ext_list
+        return gs_parser.parse_search_results(driver.page_source, name_list)
         
     def _search_name_list_expand(self, scholar_list, simple=True):
         """Expand the name_list to full_name_list."""
-        new_scholar_list = []
-        for scholar in scholar_list:
-            if 'gs_sid' in scholar:
-                url = self._gsidsearch.format(scholar['gs_sid'])
-                self.driver.get(url)
-                scholar_dict = self._search_gsid_helper(self.driver, url, simple=simple)
-                if scholar_dict is not None:
-                    new_scholar_list.append(scholar_dict)
-                time.sleep(5)
-        return new_scholar_list
+        urls = [self._gsidsearch.format(scholar['gs_sid']) for scholar in scholar_list if 'gs_sid' in scholar]
+        return [scholar_dict for scholar_dict in self.fetch_profiles(urls, simple=simple) if scholar_dict is not None]
+
+
+def _year(paper: list) -> int:
+    """Publication year of a paper row of <gs_parser.parse_papers()>, 0 if it has none."""
+    return int(paper[5]) if paper[5].isdigit() else 0
@@ -1,18 +1,16 @@
-import pandas as pd
-import numpy as np
-import pickle
 import json
-import typing
-from typing import List, Union
-import os
+import asyncio
+import hashlib
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Union, TYPE_CHECKING
 import re
-import time
-import sys
-import requests
-from difflib import SequenceMatcher
-from bs4 import BeautifulSoup
-from .Scholar78kSearch import Scholar78kSearch
-from .ScholarGsSearch import ScholarGsSearch
+from .RateLimiter import default_rate_limiter
+from .ResultCache import ResultCache
+from .gs_parser import gs_sid_from_url
+from . import similarity
+if TYPE_CHECKING:
+    import numpy as np
 
 
 class ScholarSearch():
@@ -21,33 +19,78 @@ class ScholarSearch():
         # attributes
         self.similarity_ratio = 0.8
         self.driver_path = '../chromedriver'
+        # attach to the shared, memory-mapped 78k store instead of loading a private copy (see <Scholar78kSearch>)
+        self.shared_78k = False
+        # backend used to load Google Scholar pages: 'webdriver' (headless Chrome) or 'http' (no browser)
+        self.gs_backend = 'webdriver'
+        # number of browsers (or http connections) used for concurrent Google Scholar page loads
+        self.gs_pool_size = 1
+        # optional <PageCache> of Google Scholar pages, e.g. PageCache('source/page_cache.sqlite')
+        self.gs_page_cache = None
+        # optional <SnapshotStore> of full Google Scholar profiles, refreshed incrementally by <self.search_gs.refresh_gsid()>
+        self.gs_snapshot_store = None
+        # optional <NegativeCache> of queries that returned no candidates, e.g. NegativeCache('source/negative_cache.sqlite')
+        self.negative_cache = None
+        # number of <self.aget_scholar()> searches that run at once
+        self.async_concurrency = 4
+        # LRU cache of <self.get_scholar()> results keyed by <get_query_key()>; see <ResultCache> for size / ttl / hit counters
+        self.result_cache = ResultCache(max_size=1024, ttl=600)
+        self._async_executor = None
+        self._async_executor_size = None
+        # how <self.select_final_cands()> ranks OpenReview query candidates. None keeps the original ranking: gs_sid
+        # matches, then relations, then domain labels; a dict like {'gs_sid': 10.0, 'relations': 2.0, 'domain_labels': 1.0}
+        # ranks by the weighted sum of the scores, each in [0, 1], ties going to the earlier candidate
+        self.rank_weights = None
+        # number of OpenReview ids `~First_Last<n>` probed at once by <self.get_or_scholars()>
+        self.or_concurrency = 4
+        self.or_session = None
+        # per-host rate limiter shared by the Google Scholar and OpenReview requests
+        self.rate_limiter = default_rate_limiter
+        # OpenReview id -> profile, filled by <self.get_profiles()>
+        self.profile = {}
     
     def setup(self):
         # self.get_profiles(['review_data/area_chair_id_to_profile.json', 'review_data/reviewer_id_to_profile.json'])
         # self.get_profiles(None)
-        self.search_78k = Scholar78kSearch()
-        self.search_gs = ScholarGsSearch(self.driver_path)
+        # imported here so that importing this module stays cheap (no numpy / selenium until setup)
+        from .Scholar78kSearch import Scholar78kSearch
+        from .ScholarGsSearch import ScholarGsSearch
+        self.search_78k = Scholar78kSearch(shared=self.shared_78k)
+        self.search_gs = ScholarGsSearch(self.driver_path, backend=self.gs_backend, rate_limiter=self.rate_limiter, pool_size=self.gs_pool_size, page_cache=self.gs_page_cache, snapshot_store=self.gs_snapshot_store)
 
     def reset(self):
         pass
 
-    def get_profiles(self, filepath_list: List[str] = None) -> None:
+    def get_profiles(self, filepath_list: List[str] = None, store_path: str = 'source/or_profiles.sqlite') -> None:
         """In case that you want to get responses of a list of scholars, 
         the method is implemented for you to load (could be multiple) json data files.
 
+        The files are streamed into an on-disk <ProfileStore>, so memory stays flat however large they are, and files
+        that were already ingested are not read again on the next run. The store only serves the profiles of
+        <filepath_list>: files given in an earlier run and not any more are dropped from it. As with the dict, a later
+        file wins for ids present in several files. Profiles are then loaded one by one on lookup.
+
         Parameters
         ----------
         filepath_list : list of json data filepaths to load.
+        store_path : path of the SQLite profile store. If None, the files are loaded into an in-memory dict instead.
 
         """
         if filepath_list is None:
             return
-        # set of json data dicts
-        self.profile = {}
-        for filepath in filepath_list:
-            with open(filepath) as file:
-                profile = json.load(file)
-                self.profile.update(profile)
+        if store_path is None:
+            # set of json data dicts
+            self.profile = {}
+            for filepath in filepath_list:
+                with open(filepath) as file:
+                    profile = json.load(file)
+                    self.profile.update(profile)
+        else:
+            from .ProfileStore import ProfileStore
+            self.profile = ProfileStore(store_path)
+            n_profiles = self.profile.sync(filepath_list)
+            if n_profiles > 0:
+                print(f'[Info] Ingested {n_profiles} profiles from {len(filepath_list)} files.')
         # number of unique json data dicts in total
         print(f'Number of unique json data dicts in total: {len(self.profile)}')
 
@@ -74,21 +117,35 @@ class ScholarSearch():
 
         """
 
-        self.search_78k.simple = simple
         self.search_78k.print_true = print_true
         self.search_gs.print_true = print_true
         self.print_true = print_true
         self.reset()
 
         scholar_cnt = 0
-        if type(query) is dict:
-            # query is dict
-            resp = self.search_dict(query, simple=simple, top_n=top_n)
-        elif type(query) is str:
-            # query is str
-            resp = self.search_name(query, simple=simple, top_n=top_n)                
+        cache_key = get_query_key(query, simple=simple, top_n=top_n)
+        resp = self.result_cache.get(cache_key) if cache_key is not None else None
+        # whether a query returns nothing does not depend on <simple>, so it is left out of the negative cache key
+        negative_key = json.dumps(cache_key[:-2] + cache_key[-1:]) if cache_key is not None else None
+        if resp is not None:
+            if print_true:
+                print('[Info] Found the query in the result cache.')
+        elif self.negative_cache is not None and negative_key is not None and negative_key in self.negative_cache:
+            if print_true:
+                print('[Info] The query returned no candidates recently, skip searching (negative cache).')
+            resp = []
         else:
-            raise TypeError(f'[Error] The argument "query" must be str or dict, not {type(query)}.')
+            if type(query) is dict:
+                # query is dict
+                resp = self.search_dict(query, simple=simple, top_n=top_n)
+            elif type(query) is str:
+                # query is str
+                resp = self.search_name(query, simple=simple, top_n=top_n)                
+            else:
+                raise TypeError(f'[Error] The argument "query" must be str or dict, not {type(query)}.')
+            self.result_cache.set(cache_key, resp)
+            if self.negative_cache is not None and len(resp) == 0:
+                self.negative_cache.add(negative_key)
 
         
         # select specific features
@@ -125,6 +182,51 @@ class ScholarSearch():
                 print(resp_str)
             return resp
     
+    async def aget_scholar(
+        self,
+        query: Union[str, dict],
+        field: List[str] = None,
+        simple: bool = True,
+        top_n: int = 3,
+        print_true: bool = True) -> List[dict]:
+        """Asyncio version of <self.get_scholar()>, with the same arguments and result.
+
+        The blocking search (78k lookup, OpenReview requests, Google Scholar page loads) runs in a worker
+        thread, so the event loop is not stalled. At most <self.async_concurrency> searches run at once (a new value
+        applies from the next call); set <self.gs_pool_size> at least as large so that they do not queue up on the browsers.
+        """
+        if self._async_executor is None or self._async_executor_size != self.async_concurrency:
+            # <self.async_concurrency> changed: searches already running finish in the old executor
+            if self._async_executor is not None:
+                self._async_executor.shutdown(wait=False)
+            self._async_executor = ThreadPoolExecutor(max_workers=self.async_concurrency)
+            self._async_executor_size = self.async_concurrency
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._async_executor,
+            functools.partial(self.get_scholar, query, field=field, simple=simple, top_n=top_n, print_true=print_true),
+        )
+
+    async def aget_scholars(
+        self,
+        queries: List[Union[str, dict]],
+        field: List[str] = None,
+        simple: bool = True,
+        top_n: int = 3,
+        print_true: bool = True,
+        return_exceptions: bool = False) -> List[List[dict]]:
+        """Run <self.aget_scholar()> over <queries> concurrently.
+
+        Returns
+        -------
+        resp_list : one response list per query, in the order of <queries>. With <return_exceptions>, a failed
+            query yields its exception instead of cancelling the batch (see asyncio.gather).
+        """
+        return await asyncio.gather(
+            *[self.aget_scholar(query, field=field, simple=simple, top_n=top_n, print_true=print_true) for query in queries],
+            return_exceptions=return_exceptions,
+        )
+
     def search_name(self, name: str, simple: bool = True, top_n: int = 3, from_dict: bool = False, query_dict: dict = None) -> List[dict]:
         """Search gs profile given name or OpenReview id.
         
@@ -141,15 +243,13 @@ class ScholarSearch():
         resp : list of candidate scholars, empty if no candidates are found.
         """
 
-        self.search_78k.simple = simple
         name = name.strip()
         dict = None
         real_name = True
         # OpenReview id
         if ' ' not in name and name[0] == '~':
             # search over chair id
-            if name in self.profile:
-                dict = self.profile[name]
+            dict = self.profile.get(name)
             # crawl http api response
             if dict is not None and not from_dict:
                 # name
@@ -168,21 +268,25 @@ class ScholarSearch():
             if from_dict:
                 print('Not find by gs_sid, search from_dict')
                 # it inputs a real name (firstname, lastname)
-                resp = self.search_78k.search_name(name, query_dict)
+                resp = self.search_78k.search_name(name, query_dict, simple=simple)
                 resp_gs = self.search_gs.search_name(name, query_dict, top_n=top_n, simple=simple)
                 resp = self.select_final_cands(resp, top_n, query_dict=query_dict, resp_gs_prop={'resp_gs': resp_gs})
             else:
                 # or_resp = self.get_or_scholars(or_name)
                 # TODO: resp_gs for only searching name is not implemented
                 # resp = self.select_final_cands(resp, or_resp, top_n, simple=simple)
-                resp = self.search_78k.search_name(name)
+                resp = self.search_78k.search_name(name, simple=simple)
                 resp_gs = self.search_gs.search_name(name, query_dict=None, top_n=top_n, simple=simple)
                 resp = self.select_final_cands(resp, top_n, query_dict=None, resp_gs_prop={'resp_gs': resp_gs})
         return resp
     
 
     def get_or_scholars(self, or_name: Union[str, list]):
-        """Get OpenReview candidate scholars list by name through http api response."""
+        """Get OpenReview candidate scholars list by name through http api response.
+
+        The numbered ids `~First_Last1`, `~First_Last2`, ... of a name are probed <self.or_concurrency> at a time
+        over a pooled session, and probing stops after the second missing id, as with a one-by-one walk.
+        """
         # format the name list to get OpenReview rest api response
         if type(or_name) is list:
             or_name_list = []
@@ -211,32 +315,31 @@ class ScholarSearch():
         del or_name
 
         # get request response
-        go_ahead = True
+        if self.or_session is None:
+            self.setup_or_session()
         resp_list = []
-        for name in or_name_list:
-            if name[-1].isnumeric():
-                name_cur = name
-                go_ahead = False
-                name_cur_cnt = 1
-            else:
-                name_cur_cnt = 1
-                name_cur = f'{name}{name_cur_cnt}'
-
-            # set accumulative count
-            acc_cnt = 0
-            while acc_cnt <= 1:
-                response = requests.get(f'https://openreview.net/profile?id={name_cur}')
-                time.sleep(1)
+        with ThreadPoolExecutor(max_workers=max(1, self.or_concurrency)) as executor:
+            for name in or_name_list:
+                if name[-1].isnumeric():
+                    # a complete id: probe it alone
+                    resp = self._get_or_profile(name)
+                    if resp is not None:
+                        resp_list.append(resp)
+                    continue
 
-                if not response.ok:
-                    acc_cnt += 1
-                else:
-                    soup = BeautifulSoup(response.content.decode('utf-8'), 'html.parser')
-                    resp_list.append(json.loads(soup.find_all('script', id="__NEXT_DATA__")[0].string))
-                name_cur_cnt += 1
-                name_cur = f'{name}{name_cur_cnt}'
-                if not go_ahead:
-                    break
+                # probe a window of suffixes at once, consume the answers in order and stop at the second miss
+                acc_cnt = 0
+                name_cur_cnt = 1
+                while acc_cnt <= 1:
+                    window = [f'{name}{name_cur_cnt + i}' for i in range(max(1, self.or_concurrency))]
+                    name_cur_cnt += len(window)
+                    for resp in executor.map(self._get_or_profile, window):
+                        if acc_cnt > 1:
+                            break
+                        if resp is None:
+                            acc_cnt += 1
+                        else:
+                            resp_list.append(resp)
         if self.print_true:
             if len(resp_list) != 1:
                 print(f'[Info] Found {len(resp_list)} scholars using OpenReview REST API.')
@@ -245,6 +348,32 @@ class ScholarSearch():
         return resp_list 
         # NOTE: the dict in this list is in a different format than the dict from OpenReview dataset.
 
+    def setup_or_session(self):
+        """Setup the pooled http session used to probe OpenReview profiles."""
+        import requests
+        self.or_session = requests.Session()
+        pool_size = max(1, self.or_concurrency)
+        adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.or_session.mount('https://', adapter)
+
+    def _get_or_profile(self, or_id: str, max_retries: int = 3) -> dict:
+        """Fetch the profile page of <or_id> and return its `__NEXT_DATA__` dict, or None if there is no such profile."""
+        url = f'https://openreview.net/profile?id={or_id}'
+        for _ in range(max_retries + 1):
+            self.rate_limiter.wait(url)
+            response = self.or_session.get(url, timeout=30)
+            if response.status_code != 429:
+                break
+            # throttled: back off and retry the same id
+            retry_after = response.headers.get('Retry-After')
+            self.rate_limiter.backoff(url, float(retry_after) if retry_after is not None and retry_after.isdigit() else None)
+        else:
+            return None
+        self.rate_limiter.success(url)
+        if not response.ok:
+            return None
+        return extract_next_data(response.content.decode('utf-8'))
+
     def select_final_cands(self, resp: List[dict], top_n: int, query_dict: dict = None, resp_gs_prop: dict = None, simple: bool = True) -> List[dict]:
         """Select final candidates according to the response from OpenReview and 78k data.
         
@@ -272,131 +401,106 @@ class ScholarSearch():
             # if there are one candidate from google scholar pages, we throw out resp from 78k data.
             if len(resp_gs) == 1:
                 resp = []
-            # iterate over resp_gs
-            for resp_gs_item in resp_gs:
-                find_flag = False
-                # gs_sid
-                for resp_item in resp:
-                    if resp_gs_item['gs_sid'] == resp_item['gs_sid']:
-                        find_flag = True
+            resp_gs_sids = set(resp_item['gs_sid'] for resp_item in resp)
+            # iterate over resp_gs. Profiles that are not in the 78k data are fetched together, concurrently, and
+            # merged back at their place in resp_gs; the remaining candidates get another round only if some failed.
+            pending = list(resp_gs)
+            while len(pending) > 0:
+                fetch_idx = []
+                n_planned = len(resp)
+                for idx, resp_gs_item in enumerate(pending):
+                    # gs_sid
+                    if resp_gs_item['gs_sid'] in resp_gs_sids:
+                        continue
+                    if query_dict is None and n_planned > top_n:
                         break
-                if find_flag:
-                    continue
-                # construct new prep
+                    # reuse the full dict from 78k data if the candidate is there
+                    if resp_gs_item['gs_sid'] is not None:
+                        resp_78k = self.search_78k.lookup_gsid(resp_gs_item['gs_sid'], simple=simple)
+                        if len(resp_78k) > 0:
+                            resp.append(resp_78k[0])
+                            resp_gs_sids.add(resp_gs_item['gs_sid'])
+                            n_planned += 1
+                            continue
+                    # construct new prep: placeholder for the full dict, counted as if the fetch will succeed
+                    fetch_idx.append(len(resp))
+                    resp.append(resp_gs_item)
+                    resp_gs_sids.add(resp_gs_item['gs_sid'])
+                    n_planned += 1
+                else:
+                    idx = len(pending)
+                pending = pending[idx:]
+
                 # generate full dict
-                self.search_gs.driver.get(resp_gs_item['url'])
-                time.sleep(5)
-                if query_dict is not None or (query_dict is None and len(resp) <= top_n):
-                    resp_gs_full_item = self.search_gs._search_gsid_helper(self.search_gs.driver, resp_gs_item['url'], simple=simple)
-                    if resp_gs_full_item is not None:
-                        resp.append(resp_gs_full_item)
+                resp_gs_full_items = self.search_gs.fetch_profiles([resp[i]['url'] for i in fetch_idx], simple=simple)
+                n_failed = 0
+                for i, resp_gs_full_item in zip(fetch_idx, resp_gs_full_items):
+                    if resp_gs_full_item is None:
+                        resp_gs_sids.discard(resp[i]['gs_sid'])
+                        n_failed += 1
+                    else:
+                        resp_gs_sids.add(resp_gs_full_item['gs_sid'])
+                    resp[i] = resp_gs_full_item
+                resp = [resp_item for resp_item in resp if resp_item is not None]
+                if n_failed == 0:
+                    break
         
         if query_dict is None:
             return resp[:top_n]
 
-        # calculate rankings
-        rank = {}
-        for idx_cand, cand in enumerate(resp):
-            rank[idx_cand] = []
-            gs_sid_flag = 0
-            cnt_true = [0] * len(or_keyword_list) 
-            cnt_all = 0
-            cnt_true_rel = [0] * len(or_keyword_list) 
-            cnt_all_rel = 0
-            for idx_or_scholar, or_scholar in enumerate(or_keyword_list):
-                # gs_sid
-                if 'gs_sid' in cand:
-                    if cand['gs_sid'] == or_scholar['gs_sid']: 
-                        gs_sid_flag = 1
-
-                # domain_labels
-                if cand['domain_labels'] is not None:
-                    for cand_domain_tag in cand['domain_labels']:
-                        cnt_all += 1
-                        for or_domain_tag in or_scholar['domain_labels']:
-                            if get_str_similarity(cand_domain_tag, or_domain_tag) >= self.similarity_ratio:
-                                cnt_true[idx_or_scholar] += 1
-                
-                
-                # relations
-                cnt_all_rel = 0
-                # print(cand)
-                if cand['coauthors'] is not None:
-                    for cand_coauth in cand['coauthors']:
-                        cnt_all_rel += 1
-                        for or_coauth in or_scholar['coauthors']:
-                            if get_str_similarity(or_coauth, cand_coauth[1]) >= self.similarity_ratio:
-                                cnt_true_rel[idx_or_scholar] += 1
-                
-            # get the rank list
-            # gs_sid
-            if gs_sid_flag:
-                rank[idx_cand].append(1)
-            else:
-                rank[idx_cand].append(0)
-            
-            # domain_labels
-            for i in range(len(cnt_true)):
-                if cnt_all == 0:
-                    cnt_true[i] = 0
-                else:
-                    cnt_true[i] = cnt_true[i] / cnt_all
-            rank[idx_cand].append(max(cnt_true))
-
-            # relations
-            for i in range(len(cnt_true_rel)):
-                if cnt_all_rel == 0:
-                    cnt_true_rel[i] = 0
-                else:
-                    cnt_true_rel[i] = cnt_true_rel[i] / cnt_all_rel
-            rank[idx_cand].append(max(cnt_true_rel))
-        
-        # select final candidate
-        final_idx = []
-        for rank_idx in rank:
-            if rank[rank_idx][0] == 1:
-                final_idx.append(rank_idx)
-        
-        # TODO: or we can set weights to (relations, domain_tags) to rank the scholar candidates
-        if len(final_idx) < top_n:
-            domain_tag_rank = []
-            relation_rank = []
-            for rank_idx in sorted(rank.keys()):
-                # print(rank_idx)
-                domain_tag_rank.append(rank[rank_idx][1])
-                relation_rank.append(rank[rank_idx][2])
-            # print(domain_tag_rank, relation_rank)
-            domain_tag_idxes = np.argsort(domain_tag_rank)[::-1]
-            relation_idxes = np.argsort(relation_rank)[::-1]
-            for idx in relation_idxes:
-                if relation_rank[idx] == 0:
-                    break
-                if len(final_idx) < top_n:
-                    if idx not in final_idx:
-                        final_idx.append(idx)
-                else:
-                    break
-            for idx in domain_tag_idxes:
-                if domain_tag_rank[idx] == 0:
-                    break
-                if len(final_idx) < top_n:
-                    if idx not in final_idx:
-                        final_idx.append(idx)
-                else:
-                    break
-            if len(final_idx) == 0 and len(rank.keys()) > 0:
-                    for rank_idx in sorted(rank.keys()):
-                        if len(final_idx) >= top_n:
-                            break
-                        else:
-                            final_idx.append(rank_idx)
-        # print(resp)
-        # print(or_keyword_list)
-        # print(rank)
-        # print(final_idx)
+        import numpy as np
+        n_cand = len(resp)
+        # score every candidate on each criterion, as arrays over all candidates at once
+        or_gs_sids = set(or_scholar['gs_sid'] for or_scholar in or_keyword_list)
+        scores = {
+            'gs_sid': np.array([1.0 if cand.get('gs_sid') in or_gs_sids else 0.0 for cand in resp]),
+            'domain_labels': np.zeros(n_cand),
+            'relations': np.zeros(n_cand),
+        }
+        # exact gs_sid matches win anyway: with <top_n> of them the similarity scores are never looked at
+        if np.count_nonzero(scores['gs_sid']) < top_n:
+            # fraction of the candidate's domain labels / coauthors that are similar to the OpenReview ones, best over <or_keyword_list>
+            cand_domain_labels = [cand['domain_labels'] or [] for cand in resp]
+            cand_coauthors = [[cand_coauth[1] for cand_coauth in cand['coauthors'] or []] for cand in resp]
+            for or_scholar in or_keyword_list:
+                scores['domain_labels'] = np.maximum(scores['domain_labels'], self._similar_fraction(cand_domain_labels, or_scholar['domain_labels']))
+                scores['relations'] = np.maximum(scores['relations'], self._similar_fraction(cand_coauthors, or_scholar['coauthors']))
+        idx = np.arange(n_cand)
+        if self.rank_weights is None:
+            # the order of the original loops: gs_sid matches in candidate order, then the candidates with similar
+            # co-authors by decreasing relations score, then the ones with only similar domain labels by decreasing
+            # domain labels score. Ties on a score go to the later candidate, as with argsort()[::-1].
+            tier = np.select([scores['gs_sid'] > 0, scores['relations'] > 0, scores['domain_labels'] > 0], [0, 1, 2], default=3)
+            tier_score = np.select([tier == 1, tier == 2], [scores['relations'], scores['domain_labels']], default=0)
+            final_idx = np.lexsort((np.where(tier == 0, idx, -idx), -tier_score, tier))
+            final_idx = final_idx[tier[final_idx] < 3][:top_n]
+        else:
+            total = sum(self.rank_weights.get(key, 0) * score for key, score in scores.items())
+            final_idx = idx[total > 0]
+            if len(final_idx) > top_n > 0:
+                # select the <top_n> best without sorting the others; the ones tied with the last of them are taken in candidate order
+                kth = total[final_idx[np.argpartition(-total[final_idx], top_n - 1)[top_n - 1]]]
+                above = final_idx[total[final_idx] > kth]
+                final_idx = np.concatenate([above, final_idx[total[final_idx] == kth][:top_n - len(above)]])
+            # then sort them, ties broken by the original order
+            final_idx = final_idx[np.lexsort((final_idx, -total[final_idx]))][:top_n]
+        if len(final_idx) == 0:
+            final_idx = range(min(top_n, n_cand))
         resp = [resp[i] for i in final_idx]
         return resp
 
+    def _similar_fraction(self, cand_strs: List[List[str]], or_strs: List[str]) -> 'np.ndarray':
+        """For each candidate, the number of (candidate string, OpenReview string) pairs with a similarity of at
+        least <self.similarity_ratio>, divided by the number of candidate strings (0 for a candidate without any)."""
+        import numpy as np
+        n_strs = np.array([len(strs) for strs in cand_strs], dtype=np.int64)
+        flat_strs = [s for strs in cand_strs for s in strs]
+        # one matrix over the strings of all candidates, then summed per candidate
+        matrix = similarity.cdist(flat_strs, or_strs, score_cutoff=self.similarity_ratio)
+        n_similar = np.count_nonzero(matrix >= self.similarity_ratio, axis=1)
+        counts = np.bincount(np.repeat(np.arange(len(cand_strs)), n_strs), weights=n_similar, minlength=len(cand_strs))
+        return np.divide(counts, n_strs, out=np.zeros(len(cand_strs)), where=n_strs > 0)
+
     def search_dict(self, query_dict: dict, simple: bool = True, top_n: int = 3):
         """Search candidates given a dictionary.
         
@@ -411,16 +515,14 @@ class ScholarSearch():
         resp : list of candidate scholars, empty if no candidates are found.
 
         """
-        self.search_78k.simple = simple
         # gs_sid
-        if 'gscholar' in query_dict['profile']['content'] and 'user=' in query_dict['profile']['content']['gscholar']:
-            tmp_gs_sid = query_dict['profile']['content']['gscholar'].split('user=', 1)[1]
-            if len(tmp_gs_sid) >= 12:
-                gs_sid = tmp_gs_sid[:12]
-                name_df = self.search_78k.df.loc[self.search_78k.df['gs_sid'] == gs_sid].copy()
-                if name_df.shape[0] != 0:
+        if 'gscholar' in query_dict['profile']['content']:
+            gs_sid = gs_sid_from_url(query_dict['profile']['content']['gscholar'])
+            if gs_sid is not None:
+                resp = self.search_78k.lookup_gsid(gs_sid, simple=simple)
+                if len(resp) != 0:
                     print(f'[Info] Found a scholar using 78k gs_sid')
-                    return self.search_78k._deal_with_simple(name_df)
+                    return resp
                 else:
                     print(f'[Info] Found a scholar using query dict gs_sid')
                     resp = self.search_gs.search_gsid(gs_sid, simple=simple)
@@ -431,6 +533,35 @@ class ScholarSearch():
         # search_name
         return self.search_name(query_dict['profile']['id'], simple=simple, top_n=top_n, from_dict=True, query_dict=query_dict)
 
+def get_query_key(query: Union[str, dict], simple: bool = True, top_n: int = 3) -> tuple:
+    """Canonical, hashable form of a <ScholarSearch.get_scholar()> query, or None if the query has the wrong type.
+
+    Names are compared case- and whitespace-insensitively. A dict is identified by its gs_sid if it has one,
+    otherwise by its OpenReview id and a hash of its content.
+    """
+    if type(query) is str:
+        name = ' '.join(query.split())
+        if name.startswith('~') and ' ' not in name:
+            return ('or_id', name, simple, top_n)
+        return ('name', name.lower(), simple, top_n)
+    if type(query) is dict:
+        content = query['profile'].get('content', {})
+        gs_sid = gs_sid_from_url(content['gscholar']) if 'gscholar' in content else None
+        if gs_sid is not None:
+            return ('gs_sid', gs_sid, simple, top_n)
+        content_hash = hashlib.sha1(json.dumps(content, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+        return ('or_profile', query['profile'].get('id'), content_hash, simple, top_n)
+    return None
+
+_next_data_re = re.compile(r'<script[^>]*\bid=["\']__NEXT_DATA__["\'][^>]*>(.*?)</script>', re.DOTALL)
+
+def extract_next_data(html: str) -> dict:
+    """Return the json of the `<script id="__NEXT_DATA__">` tag of a Next.js page, or None if it has none."""
+    match = _next_data_re.search(html)
+    if match is None:
+        return None
+    return json.loads(match.group(1))
+
 def generate_or_keyword_list(query_dict: dict) -> List[dict]:
     """Generate necessary keyword lists to help selecting final candidates."""
     or_keyword_list = []
@@ -466,6 +597,6 @@ def generate_or_keyword_list(query_dict: dict) -> List[dict]:
 
 def get_str_similarity(a: str, b: str) -> float:
     """Calculate the similarity of two strings and return a similarity ratio."""
-    return SequenceMatcher(None, a, b).ratio()
+    return similarity.ratio(a, b)
 
 
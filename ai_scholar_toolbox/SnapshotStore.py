@@ -0,0 +1,64 @@
+import os
+import json
+import time
+import zlib
+import sqlite3
+import threading
+from typing import Optional
+
+
+class SnapshotStore():
+    """Persistent gs_sid -> full profile (with paper list) snapshots in a SQLite file.
+
+    <ScholarGsSearch.refresh_gsid()> reads the last snapshot of a scholar to fetch only what changed since, and
+    writes the refreshed profile back. The store is safe to share between threads.
+    """
+    def __init__(self, path: str = 'source/gs_snapshots.sqlite'):
+        """
+        Parameters
+        ----------
+        path : path of the SQLite file, created if needed.
+        """
+        self.path = path
+        if os.path.dirname(path) != '' and not os.path.exists(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('CREATE TABLE IF NOT EXISTS snapshots (gs_sid TEXT PRIMARY KEY, value BLOB NOT NULL, updated REAL NOT NULL)')
+        self._conn.commit()
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM snapshots').fetchone()[0]
+
+    def __contains__(self, gs_sid):
+        with self._lock:
+            return self._conn.execute('SELECT 1 FROM snapshots WHERE gs_sid = ?', (gs_sid,)).fetchone() is not None
+
+    def get(self, gs_sid: str) -> Optional[dict]:
+        """Return the last snapshot of <gs_sid>, or None if there is none."""
+        with self._lock:
+            row = self._conn.execute('SELECT value FROM snapshots WHERE gs_sid = ?', (gs_sid,)).fetchone()
+        if row is None:
+            return None
+        return json.loads(zlib.decompress(row[0]).decode('utf-8'))
+
+    def updated(self, gs_sid: str) -> Optional[float]:
+        """Return the time (seconds since the epoch) the snapshot of <gs_sid> was written, or None."""
+        with self._lock:
+            row = self._conn.execute('SELECT updated FROM snapshots WHERE gs_sid = ?', (gs_sid,)).fetchone()
+        return row[0] if row is not None else None
+
+    def set(self, gs_sid: str, scholar_dict: dict):
+        """Store <scholar_dict> as the snapshot of <gs_sid>, replacing the previous one."""
+        value = zlib.compress(json.dumps(scholar_dict).encode('utf-8'))
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO snapshots (gs_sid, value, updated) VALUES (?, ?, ?)',
+                (gs_sid, value, time.time()),
+            )
+            self._conn.commit()
+
+    def close(self):
+        self._conn.close()
@@ -0,0 +1,80 @@
+import queue
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+
+def create_webdriver(driver_path):
+    """Create a headless Chrome driver set up for Google Scholar."""
+    # selenium is imported here rather than at module level to keep `import ai_scholar_toolbox` fast
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import ChromiumOptions
+    options = ChromiumOptions()
+    options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    options.add_experimental_option('useAutomationExtension', False)
+    options.add_argument('--headless')
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+
+    driver = webdriver.Chrome(driver_path, options=options)
+    driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {
+        "source": "Object.defineProperty(navigator, 'webdriver', {get: () => undefined})"
+    })
+    return driver
+
+
+class WebDriverPool():
+    """A fixed pool of headless Chrome drivers with a checkout / return API.
+
+    A driver is used by one caller at a time: <self.checkout()> blocks until one is free, and
+    <self.checkin()> hands it back. <self.map()> fans a function out over the pool.
+    """
+    def __init__(self, driver_path, size: int = 1):
+        """
+        Parameters
+        ----------
+        driver_path : path of the browser driver.
+        size : number of browsers in the pool.
+        """
+        if size < 1:
+            raise ValueError(f'Argument "size" passed to WebDriverPool must be at least 1, not {size}.')
+        self.size = size
+        self.drivers = [create_webdriver(driver_path) for _ in range(size)]
+        self._free = queue.Queue()
+        for driver in self.drivers:
+            self._free.put(driver)
+
+    def checkout(self, timeout: float = None):
+        """Take a free driver out of the pool, waiting up to <timeout> seconds (forever if None)."""
+        return self._free.get(timeout=timeout)
+
+    def checkin(self, driver):
+        """Return a driver taken with <self.checkout()> to the pool."""
+        self._free.put(driver)
+
+    @contextmanager
+    def driver(self, timeout: float = None):
+        """Context manager around <self.checkout()> / <self.checkin()>."""
+        driver = self.checkout(timeout=timeout)
+        try:
+            yield driver
+        finally:
+            self.checkin(driver)
+
+    def map(self, func: Callable, items: list) -> list:
+        """Call func(driver, item) for every item, running up to <self.size> calls at once.
+
+        Returns
+        -------
+        results : return values in the order of <items>.
+        """
+        def run(item):
+            with self.driver() as driver:
+                return func(driver, item)
+        with ThreadPoolExecutor(max_workers=self.size) as executor:
+            return list(executor.map(run, items))
+
+    def quit(self):
+        """Quit every browser of the pool."""
+        for driver in self.drivers:
+            driver.quit()
@@ -1,3 +1,55 @@
-from .ScholarSearch import ScholarSearch, generate_or_keyword_list, get_str_similarity
-from .Scholar78kSearch import Scholar78kSearch
-from .ScholarGsSearch import ScholarGsSearch
+"""Find Google Scholar profiles of AI scholars.
+
+Submodules are imported on first attribute access (PEP 562), so `import ai_scholar_toolbox` does not pay for
+pandas, numpy, selenium or requests until a class that needs them is used.
+"""
+import sys
+import types
+import importlib
+
+# public name -> submodule that defines it
+_lazy_attrs = {
+    'ScholarSearch': '.ScholarSearch',
+    'generate_or_keyword_list': '.ScholarSearch',
+    'get_str_similarity': '.ScholarSearch',
+    'get_query_key': '.ScholarSearch',
+    'Scholar78kSearch': '.Scholar78kSearch',
+    'Scholar78kStore': '.Scholar78kStore',
+    'ScholarGsSearch': '.ScholarGsSearch',
+    'RateLimiter': '.RateLimiter',
+    'WebDriverPool': '.WebDriverPool',
+    'PageCache': '.PageCache',
+    'ResultCache': '.ResultCache',
+    'ProfileStore': '.ProfileStore',
+    'SnapshotStore': '.SnapshotStore',
+    'NegativeCache': '.NegativeCache',
+}
+
+__all__ = list(_lazy_attrs)
+
+
+def __getattr__(name):
+    if name in _lazy_attrs:
+        value = getattr(importlib.import_module(_lazy_attrs[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
+
+
+class _LazyModule(types.ModuleType):
+    """Keeps the public names bound to the classes rather than to the submodules named after them.
+
+    Importing a submodule (e.g. `.ResultCache`, by any module of the package) sets it as an attribute of the
+    package under its own name, which would then hide the class <__getattr__()> resolves to.
+    """
+    def __setattr__(self, name, value):
+        if name in _lazy_attrs and isinstance(value, types.ModuleType) and value.__name__ == __name__ + _lazy_attrs[name]:
+            value = getattr(value, name)
+        super().__setattr__(name, value)
+
+
+sys.modules[__name__].__class__ = _LazyModule
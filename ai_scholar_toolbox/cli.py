@@ -0,0 +1,169 @@
+"""Command line batch resolution: `ai-scholar-search queries.jsonl results.jsonl`.
+
+Every line of the input is a json string (a name, or an OpenReview id such as "~Zhijing_Jin1") or an OpenReview profile
+dict, as accepted by <ScholarSearch.get_scholar()>; a line that is not json is taken as a name. Results are appended to
+the output as each query completes, one json object per line: {"line": <input line number>, "query": ..., "resp": [...]}
+or {"line": ..., "query": ..., "error": "..."}.
+
+The output doubles as the checkpoint: when it already exists, the input lines it holds are skipped, so a killed run
+is resumed by running the same command again. Use --retry-errors to search the failed lines again.
+"""
+import os
+import sys
+import json
+import asyncio
+import argparse
+from typing import Iterator, List, Tuple
+
+
+def parse_args(argv: List[str] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog='ai-scholar-search',
+        description='Resolve the scholars of a JSONL file of names / OpenReview ids / profile dicts to Google Scholar profiles.',
+    )
+    parser.add_argument('input', help='JSONL file of queries, one per line.')
+    parser.add_argument('output', help='JSONL file the results are appended to; also used to resume an interrupted run.')
+    parser.add_argument('--concurrency', type=int, default=4, help='number of queries searched at once (default: 4).')
+    parser.add_argument('--top-n', type=int, default=3, help='maximum number of candidates per query (default: 3).')
+    parser.add_argument('--full', action='store_true', help='return full profiles with the paper list instead of simple ones.')
+    parser.add_argument('--field', action='append', default=None, help='only return this field of each candidate (repeatable).')
+    parser.add_argument('--driver-path', default='../chromedriver', help='path of the browser driver (webdriver backend).')
+    parser.add_argument('--backend', choices=['webdriver', 'http'], default='webdriver', help='how Google Scholar pages are loaded (default: webdriver).')
+    parser.add_argument('--pool-size', type=int, default=None, help='browsers / http connections for Google Scholar (default: --concurrency).')
+    parser.add_argument('--profiles', action='append', default=None, help='OpenReview profile dump to look ids up in (repeatable).')
+    parser.add_argument('--page-cache', default=None, help='SQLite file caching Google Scholar pages.')
+    parser.add_argument('--negative-cache', default=None, help='SQLite file remembering queries without candidates.')
+    parser.add_argument('--shared-78k', action='store_true', help='attach to the shared memory-mapped 78k store.')
+    parser.add_argument('--retry-errors', action='store_true', help='search the lines that failed in a previous run again.')
+    parser.add_argument('--verbose', action='store_true', help='print the progress of every search.')
+    return parser.parse_args(argv)
+
+
+def read_queries(filepath: str) -> Iterator[Tuple[int, object]]:
+    """Yield (line number, query) for the non-empty lines of <filepath>, numbered from 1."""
+    with open(filepath, encoding='utf-8') as file:
+        for line_no, line in enumerate(file, 1):
+            line = line.strip()
+            if line == '':
+                continue
+            try:
+                query = json.loads(line)
+            except json.JSONDecodeError:
+                query = line
+            yield line_no, query
+
+
+def read_checkpoint(filepath: str, retry_errors: bool = False) -> set:
+    """Return the input line numbers already in the output <filepath>.
+
+    A partially written last line (a run killed in the middle of a write) is truncated away. A corrupt line before it
+    is reported and skipped, keeping the records after it.
+    """
+    done = set()
+    if not os.path.exists(filepath):
+        return done
+    valid_size = 0
+    with open(filepath, 'rb') as file:
+        for line_no, line in enumerate(file, 1):
+            if not line.endswith(b'\n'):
+                # every record is written with its newline: this one was cut short
+                break
+            valid_size += len(line)
+            try:
+                record = json.loads(line)
+            except ValueError:
+                record = None
+            if not isinstance(record, dict) or record.get('line') is None:
+                if line.strip() != b'':
+                    print(f'[Error] Line {line_no} of {filepath} is not a result record, skipped.', file=sys.stderr)
+                continue
+            if not (retry_errors and 'error' in record):
+                done.add(record['line'])
+    if valid_size < os.path.getsize(filepath):
+        with open(filepath, 'rb+') as file:
+            file.truncate(valid_size)
+    return done
+
+
+async def resolve(scholar_search, queries: Iterator[Tuple[int, object]], output, args: argparse.Namespace) -> Tuple[int, int]:
+    """Search <queries> with at most <args.concurrency> in flight, writing each result to <output> as it completes.
+
+    Returns
+    -------
+    n_done, n_failed : number of queries written, and how many of them failed.
+    """
+    async def search(line_no, query):
+        record = {'line': line_no, 'query': query}
+        try:
+            record['resp'] = await scholar_search.aget_scholar(
+                query, field=args.field, simple=not args.full, top_n=args.top_n, print_true=args.verbose,
+            )
+        except Exception as e:
+            record['error'] = f'{type(e).__name__}: {e}'
+        return record
+
+    n_done = 0
+    n_failed = 0
+    pending = set()
+    queries = iter(queries)
+    exhausted = False
+    while not exhausted or len(pending) > 0:
+        # keep the window full without reading the whole input ahead
+        while not exhausted and len(pending) < args.concurrency:
+            try:
+                line_no, query = next(queries)
+            except StopIteration:
+                exhausted = True
+                break
+            pending.add(asyncio.ensure_future(search(line_no, query)))
+        if len(pending) == 0:
+            break
+        finished, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        n_done_before = n_done
+        for task in finished:
+            record = task.result()
+            output.write(json.dumps(record, default=str) + '\n')
+            output.flush()
+            n_done += 1
+            if 'error' in record:
+                n_failed += 1
+                print(f'[Error] Line {record["line"]}: {record["error"]}', file=sys.stderr)
+        if n_done // 100 > n_done_before // 100:
+            print(f'[Info] {n_done} queries resolved.')
+    return n_done, n_failed
+
+
+def main(argv: List[str] = None) -> int:
+    args = parse_args(argv)
+    if args.concurrency < 1:
+        raise SystemExit('--concurrency must be at least 1.')
+    done = read_checkpoint(args.output, retry_errors=args.retry_errors)
+    if len(done) > 0:
+        print(f'[Info] Resuming: {len(done)} lines of {args.input} are already in {args.output}.')
+    queries = ((line_no, query) for line_no, query in read_queries(args.input) if line_no not in done)
+
+    from .ScholarSearch import ScholarSearch
+    scholar_search = ScholarSearch()
+    scholar_search.driver_path = args.driver_path
+    scholar_search.gs_backend = args.backend
+    scholar_search.gs_pool_size = args.pool_size if args.pool_size is not None else args.concurrency
+    scholar_search.async_concurrency = args.concurrency
+    scholar_search.shared_78k = args.shared_78k
+    if args.page_cache is not None:
+        from .PageCache import PageCache
+        scholar_search.gs_page_cache = PageCache(args.page_cache)
+    if args.negative_cache is not None:
+        from .NegativeCache import NegativeCache
+        scholar_search.negative_cache = NegativeCache(args.negative_cache)
+    scholar_search.setup()
+    if args.profiles is not None:
+        scholar_search.get_profiles(args.profiles)
+
+    with open(args.output, 'a', encoding='utf-8') as output:
+        n_done, n_failed = asyncio.run(resolve(scholar_search, queries, output, args))
+    print(f'[Info] Done: {n_done} queries resolved, {n_failed} failed.')
+    return 1 if n_failed > 0 else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,201 @@
+"""Parse Google Scholar profile and author-search pages from their html.
+
+The functions produce the same dicts as the WebDriver helpers of <ScholarGsSearch>, but work on a plain html
+string, so a page can be parsed in-process in one go whether it was fetched by a browser or over http.
+"""
+import re
+from typing import List, Optional
+
+_base_url = 'https://scholar.google.com'
+
+
+def _fromstring(html: str):
+    import lxml.html
+    doc = lxml.html.fromstring(html)
+    # WebDriver's get_attribute('href') returns absolute urls
+    doc.make_links_absolute(_base_url)
+    return doc
+
+
+def _by_class(element, class_name: str) -> list:
+    return element.xpath(f".//*[contains(concat(' ', normalize-space(@class), ' '), ' {class_name} ')]")
+
+
+def _first_by_class(element, class_name: str):
+    found = _by_class(element, class_name)
+    return found[0] if len(found) > 0 else None
+
+
+def _text(element) -> str:
+    """Equivalent of WebDriver's get_attribute('textContent')."""
+    return element.text_content() if element is not None else ''
+
+
+def _inner_html(element) -> str:
+    """Equivalent of WebDriver's get_attribute('innerHTML')."""
+    import lxml.html
+    return (element.text or '') + ''.join(lxml.html.tostring(child, encoding='unicode') for child in element)
+
+
+def _href(element) -> Optional[str]:
+    if element is None:
+        return None
+    if element.tag != 'a':
+        anchors = element.xpath('.//a')
+        if len(anchors) == 0:
+            return None
+        element = anchors[0]
+    return element.get('href')
+
+
+def gs_sid_from_url(url: str) -> Optional[str]:
+    """Extract the 12-character gs_sid from a `citations?user=` url, or None."""
+    gs_sid = None
+    if 'user=' in url:
+        tmp_gs_sid = url.split('user=', 1)[1]
+        if len(tmp_gs_sid) >= 12:
+            gs_sid = tmp_gs_sid[:12]
+    return gs_sid
+
+
+def parse_profile(html: str, url: str, simple: bool = True) -> Optional[dict]:
+    """Parse a `citations?user=<gs_sid>` profile page.
+
+    Parameters
+    ----------
+    html : html of the profile page.
+    url : url of the profile page.
+    simple : whether return simple information without paper list. Otherwise only the papers present in <html> are returned.
+
+    Returns
+    -------
+    Researcher : dict of the scholar, or None if the page is not a profile page.
+
+    """
+    doc = _fromstring(html)
+    html_first_class = _by_class(doc, 'gsc_g_hist_wrp')
+    if len(html_first_class) == 0:
+        return None
+    idx_list = _first_by_class(html_first_class[0], 'gsc_md_hist_b')
+    years = [_text(i) for i in _by_class(idx_list, 'gsc_g_t')] if idx_list is not None else []
+    cites = [_inner_html(i) for i in _by_class(idx_list, 'gsc_g_al')] if idx_list is not None else []
+    rsb = _first_by_class(doc, 'gsc_rsb')
+    if rsb is None:
+        return None
+    Citations_table = [_text(i) for i in _by_class(rsb, 'gsc_rsb_std')]
+    Co_authors = _by_class(rsb, 'gsc_rsb_a')
+    if len(Co_authors) == 0:
+        Co_authors = None
+    else:
+        Co_authors = [_parse_single_author(i) for i in _by_class(Co_authors[0], 'gsc_rsb_a_desc')]
+
+    Researcher = {'url': url}
+    Researcher['gs_sid'] = gs_sid_from_url(url)
+    Researcher['coauthors'] = Co_authors
+    Researcher['citation_table'] = [Citations_table[0], Citations_table[2]] if len(Citations_table) > 2 else Citations_table
+    Researcher['cites'] = {'years': years, 'cites': cites}
+    nameList = doc.xpath("//*[@id='gsc_prf_in']")
+    if len(nameList) != 1:
+        return None
+    Researcher['name'] = _text(nameList[0]).strip()
+    infoList = _by_class(doc, 'gsc_prf_il')
+    Researcher['organization'] = _text(infoList[0]) if len(infoList) > 0 else ''
+    Researcher['domain_labels'] = [_text(i).strip().lower() for i in _by_class(infoList[2], 'gsc_prf_inta')] if len(infoList) > 2 else []
+    if not simple:
+        Researcher['papers'] = _parse_papers(doc)
+    Researcher['extra_co_authors'] = [_parse_single_coauthor(i) for i in _by_class(doc, 'gsc_ucoar')]
+    return Researcher
+
+
+def parse_papers(html: str) -> List[list]:
+    """Parse the rows of the paper table (`gsc_a_tr`) of a profile page."""
+    return _parse_papers(_fromstring(html))
+
+
+def _parse_papers(doc) -> List[list]:
+    papers = []
+    for i in _by_class(doc, 'gsc_a_tr'):
+        item = _first_by_class(i, 'gsc_a_at')
+        if item is None:
+            continue
+        paper_info = [_text(j).strip() for j in _by_class(i, 'gs_gray')]
+        cite = _first_by_class(i, 'gsc_a_ac')
+        year = _first_by_class(i, 'gsc_a_h')
+        papers.append([
+            item.get('href'), _text(item).strip(),
+            paper_info,
+            _text(cite).strip(), cite.get('href') if cite is not None else None,
+            _text(year).strip(),
+        ])
+    return papers
+
+
+def _parse_single_author(element) -> list:
+    anchors = element.xpath('.//a')
+    li = []
+    li.append(anchors[0].get('href') if len(anchors) > 0 else None)
+    li.append(_text(anchors[0]) if len(anchors) > 0 else '')
+    for i in _by_class(element, 'gsc_rsb_a_ext'):
+        li.append(_text(i))
+    return li
+
+
+def _parse_single_coauthor(element) -> dict:
+    return {
+        'name': _text(_first_by_class(element, 'gs_ai_name')),
+        'url': _href(_first_by_class(element, 'gs_ai_pho')),
+        'description': _inner_html(element),
+    }
+
+
+def parse_search_results(html: str, name_list: List[str]) -> List[dict]:
+    """Parse an author-search (`view_op=search_authors`) result page.
+
+    Parameters
+    ----------
+    html : html of the result page.
+    name_list : fragments of the name. Results whose name does not contain every fragment are skipped.
+
+    Returns
+    -------
+    useful_info_ext_list : list of candidate scholars.
+
+    """
+    doc = _fromstring(html)
+    useful_info_ext_list = []
+    for scholar_element in _by_class(doc, 'gs_ai_t'):
+        name_element = _first_by_class(scholar_element, 'gs_ai_name')
+        name = _text(name_element).strip()
+        # check whether name is correct
+        if any(name_fragment.lower() not in name.lower() for name_fragment in name_list):
+            continue
+
+        # grab all the other information
+        pos_org = _text(_first_by_class(scholar_element, 'gs_ai_aff')).strip()
+        email_str = _text(_first_by_class(scholar_element, 'gs_ai_eml')).strip()
+        cite = _text(_first_by_class(scholar_element, 'gs_ai_cby')).strip()
+        url = (_href(name_element) or '').strip()
+        domain_element = _first_by_class(scholar_element, 'gs_ai_int')
+        domain_labels = [_text(domain).strip().lower() for domain in _by_class(domain_element, 'gs_ai_ont_int')] if domain_element is not None else []
+
+        if email_str != '':
+            match = re.search(r'[\w-]+\.[\w.-]+', email_str)
+            if match is not None:
+                email_str = match.group(0)
+
+        cites = [int(s) for s in cite.split() if s.isdigit()]
+        useful_info_ext_list.append({
+            'name': name,
+            'pos_org': pos_org,
+            'email': email_str,
+            'cite': cites[0] if len(cites) > 0 else None,
+            'url': url,
+            'gs_sid': gs_sid_from_url(url),
+            'domain_labels': domain_labels,
+        })
+    return useful_info_ext_list
+
+
+def is_blocked(html: str) -> bool:
+    """Whether Google answered with a CAPTCHA / unusual traffic page instead of the requested content."""
+    return 'gs_captcha_f' in html or 'id="captcha-form"' in html or 'unusual traffic from your computer network' in html
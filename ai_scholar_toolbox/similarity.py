@@ -0,0 +1,94 @@
+"""String similarity used to rank candidate scholars.
+
+Scores are in [0, 1], with 1 for identical strings. If `rapidfuzz` is installed (`pip install ai_scholar_toolbox[fast]`),
+its C implementation of the Indel ratio is used; otherwise the scores come from `difflib.SequenceMatcher`. The two do
+not compute the same thing: SequenceMatcher matches blocks greedily and drops "junk" characters from long strings,
+so its score can be lower than the Indel ratio of the same pair, and installing `[fast]` may change the order of
+near-tied candidates. <cdist()> scores a whole queries x choices matrix in one call.
+"""
+from difflib import SequenceMatcher
+from typing import List, TYPE_CHECKING
+if TYPE_CHECKING:
+    import numpy as np
+
+_rapidfuzz = None
+
+
+def _get_rapidfuzz():
+    """Return the rapidfuzz module, or False if it is not installed. Resolved once, on first use."""
+    global _rapidfuzz
+    if _rapidfuzz is None:
+        try:
+            import rapidfuzz.distance
+            import rapidfuzz.process
+            _rapidfuzz = rapidfuzz
+        except ImportError:
+            _rapidfuzz = False
+    return _rapidfuzz
+
+
+def ratio(a: str, b: str) -> float:
+    """Calculate the similarity of two strings and return a similarity ratio."""
+    rapidfuzz = _get_rapidfuzz()
+    if rapidfuzz:
+        return rapidfuzz.distance.Indel.normalized_similarity(a, b)
+    return SequenceMatcher(None, a, b).ratio()
+
+
+def cdist(queries: List[str], choices: List[str], score_cutoff: float = None) -> 'np.ndarray':
+    """Similarity of every query to every choice.
+
+    Parameters
+    ----------
+    queries : strings of the rows.
+    choices : strings of the columns.
+    score_cutoff : scores below this are returned as 0. Pairs that cannot reach it are skipped without computing their ratio.
+
+    Returns
+    -------
+    scores : float array of shape (len(queries), len(choices)), scores[i, j] = ratio(queries[i], choices[j]).
+    """
+    import numpy as np
+    queries = list(queries)
+    choices = list(choices)
+    if len(queries) == 0 or len(choices) == 0:
+        return np.zeros((len(queries), len(choices)), dtype=np.float64)
+
+    rapidfuzz = _get_rapidfuzz()
+    if rapidfuzz:
+        return rapidfuzz.process.cdist(
+            queries, choices, scorer=rapidfuzz.distance.Indel.normalized_similarity,
+            score_cutoff=score_cutoff, dtype=np.float64, workers=1,
+        )
+
+    scores = np.zeros((len(queries), len(choices)), dtype=np.float64)
+    if score_cutoff is None:
+        candidates = np.ones(scores.shape, dtype=bool)
+    else:
+        # ratio = 2 * matches / (len(a) + len(b)) <= 2 * min(len) / (len(a) + len(b)): drop the pairs whose lengths are too far apart
+        len_q = np.array([len(query) for query in queries], dtype=np.float64)[:, None]
+        len_c = np.array([len(choice) for choice in choices], dtype=np.float64)[None, :]
+        total = len_q + len_c
+        # two empty strings are identical
+        bound = np.divide(2 * np.minimum(len_q, len_c), total, out=np.ones(scores.shape), where=total > 0)
+        candidates = bound >= score_cutoff
+    matcher = SequenceMatcher(None)
+    for j, choice in enumerate(choices):
+        rows = np.flatnonzero(candidates[:, j])
+        if len(rows) == 0:
+            continue
+        # SequenceMatcher caches what it knows about its second sequence, so each choice is indexed once
+        matcher.set_seq2(choice)
+        for i in rows:
+            query = queries[i]
+            if query == choice:
+                scores[i, j] = 1.0
+                continue
+            matcher.set_seq1(query)
+            # quick_ratio() only compares character counts and is an upper bound of ratio(), which matches the blocks
+            if score_cutoff is not None and matcher.quick_ratio() < score_cutoff:
+                continue
+            scores[i, j] = matcher.ratio()
+    if score_cutoff is not None:
+        scores[scores < score_cutoff] = 0
+    return scores
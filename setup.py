@@ -15,12 +15,19 @@ setuptools.setup(
     long_description_content_type='text/markdown',
     install_requires=[
         'gdown',
-        'bs4', 
         'selenium',
         'pandas',
         'requests',
-        'numpy'
+        'numpy',
+        'lxml'
     ],
+    extras_require={
+        # C implementation of the string similarity used to rank candidates
+        'fast': ['rapidfuzz'],
+    },
+    entry_points={
+        'console_scripts': ['ai-scholar-search=ai_scholar_toolbox.cli:main'],
+    },
     url='https://github.com/causalNLP/ai-scholar-toolbox',
     packages=setuptools.find_packages(),
     classifiers=[        
@@ -0,0 +1,22 @@
+import json
+
+from ai_scholar_toolbox.cli import read_checkpoint
+
+
+def test_read_checkpoint_keeps_records_after_a_corrupt_line(tmp_path):
+    path = tmp_path / 'results.jsonl'
+    records = [{'line': 1, 'query': 'a', 'resp': []}, {'line': 2, 'query': 'b', 'error': 'RuntimeError: x'}]
+    records_after = [{'line': 4, 'query': 'd', 'resp': []}, {'foreign': True}]
+    content = ''.join(json.dumps(record) + '\n' for record in records)
+    content += '{"line": 3, "que\n'
+    content += ''.join(json.dumps(record) + '\n' for record in records_after)
+    path.write_text(content + '{"line": 5, "query": "e", "re', encoding='utf-8')
+
+    assert read_checkpoint(str(path)) == {1, 2, 4}
+    # only the partially written last line is dropped
+    assert path.read_text(encoding='utf-8') == content
+    assert read_checkpoint(str(path), retry_errors=True) == {1, 4}
+
+
+def test_read_checkpoint_without_output(tmp_path):
+    assert read_checkpoint(str(tmp_path / 'missing.jsonl')) == set()
@@ -0,0 +1,25 @@
+import os
+import sys
+import json
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# seconds; importing the package and its search classes takes ~0.05s, pulling in pandas / numpy / selenium takes >0.5s
+IMPORT_BUDGET = 0.3
+HEAVY_MODULES = ['pandas', 'numpy', 'selenium', 'bs4', 'requests']
+
+
+def test_import_is_fast_and_defers_heavy_dependencies():
+    code = (
+        'import sys, time, json\n'
+        'start = time.perf_counter()\n'
+        'import ai_scholar_toolbox\n'
+        'from ai_scholar_toolbox import ScholarSearch, ScholarGsSearch\n'
+        'elapsed = time.perf_counter() - start\n'
+        f'print(json.dumps({{"elapsed": elapsed, "loaded": [m for m in {HEAVY_MODULES!r} if m in sys.modules]}}))\n'
+    )
+    result = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True)
+    report = json.loads(result.stdout)
+    assert report['loaded'] == []
+    assert report['elapsed'] < IMPORT_BUDGET, f'importing ai_scholar_toolbox took {report["elapsed"]:.3f}s'
@@ -0,0 +1,28 @@
+import os
+import sys
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_python(code):
+    """Run <code> in a fresh interpreter with the repository on the path and return its stdout."""
+    result = subprocess.run(
+        [sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    return result.stdout
+
+
+def test_public_names_stay_classes_after_submodule_imports():
+    # importing the submodules, as ScholarSearch and its setup() do, must not rebind the package names to them
+    out = run_python(
+        'import importlib, types\n'
+        'import ai_scholar_toolbox\n'
+        'for module in ai_scholar_toolbox._lazy_attrs.values():\n'
+        '    importlib.import_module("ai_scholar_toolbox" + module)\n'
+        'from ai_scholar_toolbox import ResultCache, RateLimiter, PageCache, ScholarGsSearch, ScholarSearch\n'
+        'ResultCache(max_size=10)\n'
+        'ScholarSearch()\n'
+        'print(all(not isinstance(getattr(ai_scholar_toolbox, name), types.ModuleType) for name in ai_scholar_toolbox.__all__))\n'
+    )
+    assert out.strip() == 'True'
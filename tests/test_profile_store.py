@@ -0,0 +1,64 @@
+import json
+
+from ai_scholar_toolbox.ProfileStore import ProfileStore, iter_json_object
+
+
+def write_json(path, obj, **kwargs):
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(obj, file, **kwargs)
+    return str(path)
+
+
+def test_store_holds_exactly_the_synced_files(tmp_path):
+    a = write_json(tmp_path / 'a.json', {'~A_A1': {'id': 'a'}, '~C_C1': {'id': 'c from a'}})
+    b = write_json(tmp_path / 'b.json', {'~B_B1': {'id': 'b'}, '~C_C1': {'id': 'c from b'}})
+    store_path = str(tmp_path / 'profiles.sqlite')
+
+    store = ProfileStore(store_path)
+    store.sync([a, b])
+    assert len(store) == 3
+    # the file given last wins, as with dict.update
+    assert store['~C_C1'] == {'id': 'c from b'}
+    store.sync([b, a])
+    assert store['~C_C1'] == {'id': 'c from a'}
+    store.close()
+
+    # another process with another file list must not see the profiles of the first one
+    store = ProfileStore(store_path)
+    assert store.sync([b]) == 0
+    assert '~A_A1' not in store
+    assert store.get('~A_A1') is None
+    assert store['~C_C1'] == {'id': 'c from b'}
+    assert len(store) == 2
+
+    # profiles removed from a re-dumped file disappear
+    write_json(b, {'~B_B1': {'id': 'b2'}}, indent=1)
+    assert store.sync([b]) == 1
+    assert '~C_C1' not in store
+    assert store['~B_B1'] == {'id': 'b2'}
+    store.close()
+
+
+def test_iter_json_object_handles_any_chunk_boundary(tmp_path):
+    obj = {
+        'a': 1.5, 'b': -2e-3, 'c': 12345, 'd': -0.25E+2, 'e': True, 'f': None, 'g': 'x"}{,:\\',
+        '~é_ü1': {'nested': [1, 2.0, {'k': 'v'}], 'empty': {}}, 'h': [], 'last': 10,
+    }
+    for indent in (None, 2):
+        path = write_json(tmp_path / 'dump.json', obj, indent=indent)
+        for chunk_size in (1, 2, 3, 7, 1 << 20):
+            assert dict(iter_json_object(path, chunk_size=chunk_size)) == obj
+
+
+def test_iter_json_object_scalars_split_at_chunk_boundary(tmp_path):
+    for text, expected in [('{"a": 1.5}', {'a': 1.5}), ('{"a":-12e-1 ,"b":3}', {'a': -1.2, 'b': 3}), ('{"a": 10}', {'a': 10})]:
+        path = tmp_path / 'scalar.json'
+        path.write_text(text, encoding='utf-8')
+        for chunk_size in range(1, len(text) + 1):
+            assert dict(iter_json_object(str(path), chunk_size=chunk_size)) == expected
+
+
+def test_iter_json_object_empty_object(tmp_path):
+    path = tmp_path / 'empty.json'
+    path.write_text(' { } ', encoding='utf-8')
+    assert list(iter_json_object(str(path))) == []
@@ -0,0 +1,89 @@
+import numpy as np
+
+from ai_scholar_toolbox.Scholar78kStore import Scholar78kStore, Scholar78kIndex
+from ai_scholar_toolbox.Scholar78kSearch import Scholar78kSearch
+
+RECORDS = [
+    {'name': 'Zhijing Jin', 'url': 'u0', 'gs_sid': 'AAAAAAAAAAA0', 'citations': 120, 'domain_labels': ['nlp', 'causality'], 'papers': [['p0', 'Title', [], '3', None, '2021']]},
+    {'name': 'Zhijing A. Jin', 'url': 'u1', 'gs_sid': 'AAAAAAAAAAA1', 'citations': 0, 'domain_labels': None, 'papers': []},
+    {'name': 'Mary Jin-Smith', 'url': 'u2', 'gs_sid': 'AAAAAAAAAAA2', 'citations': 7, 'domain_labels': [], 'papers': [], 'extra': {'k': 'v'}},
+    {'name': 'Zhijingx Jinx', 'url': 'u3', 'gs_sid': 'AAAAAAAAAAA3', 'citations': 3, 'domain_labels': ['é ü'], 'papers': []},
+    {'name': 'Bernhard Schölkopf', 'url': 'u4', 'gs_sid': 'AAAAAAAAAAA4', 'citations': 9, 'domain_labels': ['ml'], 'papers': []},
+    # same scholar as the first row under another spelling
+    {'name': 'zhijing  jin', 'url': 'u0', 'gs_sid': 'AAAAAAAAAAA0', 'citations': 120, 'domain_labels': ['nlp'], 'papers': []},
+]
+
+
+def make_search(store, shared):
+    """A Scholar78kSearch over <store>, built without downloading the dataset."""
+    search_78k = Scholar78kSearch.__new__(Scholar78kSearch)
+    search_78k.shared = shared
+    search_78k.store = store
+    search_78k.df = None if shared else store.to_dataframe(search_78k._light_columns())
+    if shared:
+        search_78k.attach_indexes()
+    else:
+        search_78k.build_name_index()
+        search_78k.build_gsid_index()
+    search_78k.simple = False
+    search_78k.verbose = False
+    search_78k.print_true = False
+    return search_78k
+
+
+def test_convert_round_trip(tmp_path):
+    path = str(tmp_path / 'store')
+    Scholar78kStore.convert(RECORDS[:1], path)
+    # converting again replaces the previous store
+    Scholar78kStore.convert(RECORDS, path)
+    store = Scholar78kStore(path)
+    assert len(store) == len(RECORDS)
+    assert store.kinds['name'] == 'str' and store.kinds['citations'] == 'array' and store.kinds['papers'] == 'json'
+    for name in store.columns:
+        expected = [record.get(name) for record in RECORDS]
+        assert list(store.column(name)) == expected
+        assert [store.cell(name, row) for row in range(len(RECORDS))] == expected
+    assert store.records([4, 0], columns=['name', 'gs_sid']) == [
+        {'name': 'Bernhard Schölkopf', 'gs_sid': 'AAAAAAAAAAA4'}, {'name': 'Zhijing Jin', 'gs_sid': 'AAAAAAAAAAA0'},
+    ]
+    df = store.to_dataframe(['name', 'citations', 'domain_labels'])
+    assert list(df.columns) == ['name', 'citations', 'domain_labels']
+    assert df['name'].tolist() == [record['name'] for record in RECORDS]
+    assert df['citations'].tolist() == [record['citations'] for record in RECORDS]
+    assert df['domain_labels'].tolist() == [record['domain_labels'] for record in RECORDS]
+
+
+def test_published_indexes_match_the_dict_indexes(tmp_path):
+    store = Scholar78kStore.convert(RECORDS, str(tmp_path / 'store'))
+    private = make_search(store, shared=False)
+    shared = make_search(store, shared=True)
+    for attr in Scholar78kSearch._index_attrs.values():
+        index = getattr(private, attr)
+        loaded = getattr(shared, attr)
+        assert isinstance(loaded, Scholar78kIndex)
+        assert len(loaded) == len(index)
+        for key, rows in index.items():
+            assert key in loaded
+            assert np.array_equal(loaded[key], rows)
+        assert 'missing key' not in loaded and loaded.get('missing key') is None and loaded.get(0) is None
+    for name in ['Zhijing Jin', 'Mary Smith', 'Bernhard Schölkopf', 'Nobody Here']:
+        assert shared.search_name(name) == private.search_name(name)
+    assert shared.lookup_gsid(['AAAAAAAAAAA4', 'MISSING', 'AAAAAAAAAAA0']) == private.lookup_gsid(['AAAAAAAAAAA4', 'MISSING', 'AAAAAAAAAAA0'])
+
+
+def test_name_matching_uses_whole_tokens(tmp_path):
+    search_78k = make_search(Scholar78kStore.convert(RECORDS, str(tmp_path / 'store')), shared=True)
+
+    def names(query):
+        return [record['name'] for record in search_78k.search_name(query, simple=True)]
+
+    # full name (normalized), or first name plus another token; rows with the same url are returned once
+    assert names('Zhijing Jin') == ['Zhijing Jin', 'Zhijing A. Jin']
+    assert names(['zhijing', 'x', 'JIN']) == ['Zhijing Jin', 'Zhijing A. Jin']
+    # parts of hyphenated last names are tokens, substrings are not
+    assert names('Mary Smith') == ['Mary Jin-Smith']
+    assert names('Zhijing Jinx') == [] and names('Zhiji Jin') == []
+    assert names('Zhijingx Jinx') == ['Zhijingx Jinx']
+    assert search_78k.search_names(['Zhijing Jin', 'Nobody', 'zhijing jin']) == [
+        search_78k.search_name('Zhijing Jin'), [], search_78k.search_name('Zhijing Jin'),
+    ]
@@ -0,0 +1,97 @@
+from ai_scholar_toolbox.ScholarGsSearch import ScholarGsSearch
+
+
+class FakeRateLimiter():
+    def __init__(self):
+        self.n_backoffs = 0
+
+    def wait(self, url):
+        pass
+
+    def success(self, url):
+        pass
+
+    def backoff(self, url, retry_after=None):
+        self.n_backoffs += 1
+
+
+class FakeResponse():
+    def __init__(self, status_code, text=''):
+        self.status_code = status_code
+        self.text = text
+        self.headers = {}
+
+
+class FakeSession():
+    """Answers every request with <respond(url)> and records the urls."""
+    def __init__(self, respond):
+        self.respond = respond
+        self.urls = []
+
+    def get(self, url, timeout=None):
+        self.urls.append(url)
+        return self.respond(url)
+
+
+def make_search(respond):
+    """A ScholarGsSearch on the http backend whose session is a <FakeSession>, built without opening a real session."""
+    gs_search = ScholarGsSearch.__new__(ScholarGsSearch)
+    gs_search._authsearch = 'https://scholar.google.com/citations?hl=en&view_op=search_authors&mauthors={0}'
+    gs_search._gsidsearch = 'https://scholar.google.com/citations?hl=en&user={0}'
+    gs_search.print_true = False
+    gs_search.backend = 'http'
+    gs_search.rate_limiter = FakeRateLimiter()
+    gs_search.page_cache = None
+    gs_search.snapshot_store = None
+    gs_search.max_retries = 2
+    gs_search.session = FakeSession(respond)
+    gs_search.timeout = 1
+    gs_search.n_workers = 1
+    return gs_search
+
+
+def test_missing_profile_is_not_an_error():
+    for body in ['', '<html><body>Not Found</body></html>']:
+        gs_search = make_search(lambda url: FakeResponse(404, body))
+        assert gs_search.search_gsid('MISSINGMISSI') == []
+        assert gs_search.search_gsid('MISSINGMISSI', simple=False) == []
+        assert gs_search.rate_limiter.n_backoffs == 0
+
+
+def test_server_errors_and_block_pages_are_retried():
+    for response in [FakeResponse(500, 'oops'), FakeResponse(503, '<form id="captcha-form"></form>')]:
+        gs_search = make_search(lambda url: response)
+        try:
+            gs_search.search_gsid('MISSINGMISSI')
+        except RuntimeError:
+            pass
+        else:
+            raise AssertionError('a page that keeps failing must raise')
+        assert len(gs_search.session.urls) == gs_search.max_retries + 1
+        assert gs_search.rate_limiter.n_backoffs == gs_search.max_retries + 1
+
+
+def profile_page(url, n_papers):
+    """Html of a profile page listing the papers of <url>'s `cstart` / `pagesize` window out of <n_papers>."""
+    query = dict(param.split('=') for param in url.split('?', 1)[1].split('&'))
+    cstart = int(query.get('cstart', 0))
+    pagesize = int(query.get('pagesize', 20))
+    rows = ''.join(
+        f'<tr class="gsc_a_tr"><td><a class="gsc_a_at" href="/paper{i}">Paper {i}</a></td>'
+        f'<td><a class="gsc_a_ac" href="/cites{i}">{i}</a></td><td><span class="gsc_a_h">2020</span></td></tr>'
+        for i in range(cstart, min(cstart + pagesize, n_papers))
+    )
+    return (
+        '<html><body><div id="gsc_prf_in">Jane Doe</div><div class="gsc_prf_il">Some University</div>'
+        '<div class="gsc_rsb"><div class="gsc_g_hist_wrp"></div><td class="gsc_rsb_std">10</td></div>'
+        f'<table>{rows}</table></body></html>'
+    )
+
+
+def test_full_profile_loads_each_page_once():
+    for n_papers, n_requests in [(0, 1), (50, 1), (100, 2), (250, 4)]:
+        gs_search = make_search(lambda url: FakeResponse(200, profile_page(url, n_papers)))
+        scholar_dict = gs_search.search_gsid('ABCDEFGHIJKL', simple=False)[0]
+        assert [paper[1] for paper in scholar_dict['papers']] == [f'Paper {i}' for i in range(n_papers)]
+        assert len(gs_search.session.urls) == n_requests
+        assert len(set(gs_search.session.urls)) == n_requests
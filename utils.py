@@ -1,5 +1,5 @@
-from difflib import SequenceMatcher
+from ai_scholar_toolbox import similarity
 
 def get_str_similarity(a: str, b: str) -> float:
     """Calculate the similarity of two strings and return a similarity ratio."""
-    return SequenceMatcher(None, a, b).ratio()
\ No newline at end of file
+    return similarity.ratio(a, b)
\ No newline at end of file